@@ -0,0 +1,28 @@
+"""
+FastAPI 应用工厂：集中管理应用创建与中间件配置（CORS 等）
+所有入口（main.py 及其别名 main_skia.py）共用同一个工厂，避免重复配置中间件
+"""
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+
+# 前端地址
+CORS_ALLOW_ORIGINS = ["http://localhost:3000", "http://localhost:5173"]
+# 原始 PNG 接口通过响应头返回渲染耗时/总高度，预览接口返回 ETag
+CORS_EXPOSE_HEADERS = ["X-Render-Time-Ms", "X-Total-Height", "ETag"]
+
+
+def create_app(title: str = "RollingInCredits API (Skia)") -> FastAPI:
+    """创建 FastAPI 应用（默认 ORJSONResponse）并挂载 CORS 中间件"""
+    app = FastAPI(title=title, default_response_class=ORJSONResponse)
+
+    # CORS 配置
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ALLOW_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=CORS_EXPOSE_HEADERS,
+    )
+    return app
@@ -1,11 +1,24 @@
 """
 FastAPI 后端主文件
 """
+import asyncio
 import base64
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response, JSONResponse
+import hashlib
+import io
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterator, List, Literal, Optional, Tuple
 
+import numpy as np
+import orjson
+from fastapi import Request
+from fastapi.responses import Response, ORJSONResponse, StreamingResponse
+
+from app.app_factory import create_app
 from app.models import (
     RenderConfig,
     PreviewResponse,
@@ -13,9 +26,10 @@ from app.models import (
     ScrollPreviewResponse,
     ScrollFullPreviewResponse,
     RenderSequenceRequest,
+    RenderBatchRequest,
 )
 # 使用 Skia 渲染引擎（更高质量的文本渲染）
-from app.render_engine_skia import RenderEngineSkia
+from app.render_engine_skia import PREVIEW_MIME_TYPE, RenderEngineSkia
 from app.render_engine_scroll import LongScrollRenderEngineSkia
 import tempfile
 import zipfile
@@ -27,22 +41,399 @@ os.makedirs(BASE_TEMP_DIR, exist_ok=True)
 # 如果需要使用 Pillow 版本，取消下面的注释并注释掉上面的导入
 # from app.render_engine import RenderEngine
 
-app = FastAPI(title="RollingInCredits API (Skia)")
+app = create_app()
+
+# 渲染线程池：渲染/编码均为同步的 CPU 密集操作，放到线程池中执行，避免阻塞事件循环
+# （Skia / OIIO 在原生代码中会释放 GIL，多个预览可并行渲染）
+_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+
+# 渲染引擎内部有字体缓存、hinting 开关等可变状态，不是线程安全的，
+# 因此每个工作线程持有一份独立的引擎实例
+_thread_local = threading.local()
+
+
+def _get_render_engine() -> RenderEngineSkia:
+    """获取当前线程的渲染引擎（使用 Skia 版本，提供更高质量的文本渲染）"""
+    engine = getattr(_thread_local, "render_engine", None)
+    if engine is None:
+        engine = _thread_local.render_engine = RenderEngineSkia()
+        # 如果使用 Pillow 版本，改为：
+        # engine = _thread_local.render_engine = RenderEngine()
+    return engine
+
+
+def _get_scroll_engine() -> LongScrollRenderEngineSkia:
+    """获取当前线程的长画布滚动渲染引擎"""
+    engine = getattr(_thread_local, "scroll_engine", None)
+    if engine is None:
+        engine = _thread_local.scroll_engine = LongScrollRenderEngineSkia()
+    return engine
+
+
+async def _run_in_executor(fn, *args, **kwargs):
+    """在渲染线程池中执行同步函数"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_EXECUTOR, partial(fn, *args, **kwargs))
+
+
+def _to_data_url(png_data: bytes, mime_type: str = "image/png") -> str:
+    """图像 bytes -> data URL（在工作线程中执行，避免在事件循环上做 base64 编码）"""
+    return f"data:{mime_type};base64,{base64.b64encode(png_data).decode('utf-8')}"
+
+
+# 预览结果缓存：key 为配置 JSON 的 blake2b 摘要（避免持有巨大的 JSON 字符串）
+# 交互编辑时经常出现与上一次完全相同的配置（防抖后落在同一状态），命中时直接返回
+PREVIEW_CACHE_SIZE = 64
+_preview_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+_preview_cache_lock = threading.Lock()
+
+
+def _config_digest(config: RenderConfig) -> bytes:
+    return hashlib.blake2b(config.model_dump_json().encode("utf-8"), digest_size=16).digest()
+
+
+def _body_digest(body: bytes) -> bytes:
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+# 预览响应的 HTTP 缓存：ETag 取配置摘要，客户端对相同配置带 If-None-Match 重复请求时直接返回 304，不再渲染
+PREVIEW_CACHE_CONTROL = "private, max-age=60, must-revalidate"
+
+
+def _preview_etag(key: bytes) -> str:
+    return f'"{key.hex()}"'
+
+
+def _cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": PREVIEW_CACHE_CONTROL}
 
-# CORS 配置
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:5173"],  # 前端地址
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-# 初始化渲染引擎（使用 Skia 版本，提供更高质量的文本渲染）
-render_engine = RenderEngineSkia()
-scroll_engine = LongScrollRenderEngineSkia()
-# 如果使用 Pillow 版本，改为：
-# render_engine = RenderEngine()
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """If-None-Match 命中时返回 304 响应，否则返回 None"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    if "*" in tags or etag in tags:
+        return Response(status_code=304, headers=_cache_headers(etag))
+    return None
+
+
+def _preview_raw_job(config: RenderConfig, key: Optional[bytes] = None):
+    start_time = time.time()
+    if key is None:
+        key = _config_digest(config)
+    with _preview_cache_lock:
+        preview_data = _preview_cache.get(key)
+        if preview_data is not None:
+            _preview_cache.move_to_end(key)
+    if preview_data is not None:
+        return preview_data, (time.time() - start_time) * 1000
+
+    preview_data, render_time = _get_render_engine().render_preview(config)
+    with _preview_cache_lock:
+        _preview_cache[key] = preview_data
+        _preview_cache.move_to_end(key)
+        while len(_preview_cache) > PREVIEW_CACHE_SIZE:
+            _preview_cache.popitem(last=False)
+    return preview_data, render_time
+
+
+def _preview_job(config: RenderConfig, key: Optional[bytes] = None):
+    preview_data, render_time = _preview_raw_job(config, key)
+    return _to_data_url(preview_data, PREVIEW_MIME_TYPE), render_time
+
+
+# 成片像素缓存：key 为配置摘要，值为 (height, width, 3) 只读 RGB 数组（4K 每条约 25MB）
+# 同一配置先后导出 DPX 和 TIFF 时只绘制一次；放在进程级而不是线程局部的引擎上，
+# 两次请求落在不同渲染线程时同样命中，内存也不会随线程数成倍增长
+FINAL_FRAME_CACHE_SIZE = 4
+_final_frame_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+_final_frame_cache_lock = threading.Lock()
+
+
+def _final_frame_pixels(config: RenderConfig) -> np.ndarray:
+    key = _config_digest(config)
+    with _final_frame_cache_lock:
+        img_array = _final_frame_cache.get(key)
+        if img_array is not None:
+            _final_frame_cache.move_to_end(key)
+            return img_array
+
+    img_array = _get_render_engine().render_final_rgb(config)
+    with _final_frame_cache_lock:
+        _final_frame_cache[key] = img_array
+        _final_frame_cache.move_to_end(key)
+        while len(_final_frame_cache) > FINAL_FRAME_CACHE_SIZE:
+            _final_frame_cache.popitem(last=False)
+    return img_array
+
+
+def _render_dpx_job(config: RenderConfig):
+    # 耗时包含取成片像素（未命中缓存时的绘制）和 DPX 写出
+    start_time = time.time()
+    dpx_data, _ = _get_render_engine().render_final_dpx(config, _final_frame_pixels(config))
+    return dpx_data, (time.time() - start_time) * 1000
+
+
+def _render_tiff_job(config: RenderConfig):
+    start_time = time.time()
+    tiff_data, _ = _get_render_engine().render_final_tiff(config, _final_frame_pixels(config))
+    return tiff_data, (time.time() - start_time) * 1000
+
+
+# 批量成片的并行度：每个工作线程持有自己的引擎（表面、画笔、字体缓存），Skia 光栅化和 OIIO 写出并行进行
+RENDER_BATCH_THREADS = int(os.getenv("RENDER_BATCH_THREADS", str(os.cpu_count() or 4)))
+# 批量成片使用独立线程池：批量任务本身运行在 _EXECUTOR 中，向同一线程池提交子任务并等待可能死锁
+_BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=max(1, RENDER_BATCH_THREADS))
+
+
+def _render_dpx_uncached_job(config: RenderConfig):
+    return _get_render_engine().render_final_dpx(config)
+
+
+def _render_tiff_uncached_job(config: RenderConfig):
+    return _get_render_engine().render_final_tiff(config)
+
+
+# 批量成片的每帧配置各不相同，不经过成片像素缓存（既不会命中，也会把交互导出的缓存条目挤掉）
+_BATCH_RENDER_JOBS = {
+    "dpx": _render_dpx_uncached_job,
+    "tiff": _render_tiff_uncached_job,
+}
+
+
+def _render_batch_job(req: RenderBatchRequest):
+    """多帧成片并行渲染，按输入顺序写入临时目录，返回帧文件路径（由 _iter_zip_stream 打包并清理）"""
+    start_time = time.time()
+    tmpdir = tempfile.mkdtemp(dir=BASE_TEMP_DIR)
+    try:
+        job = _BATCH_RENDER_JOBS[req.format]
+        frame_paths = []
+        for i, (data, _) in enumerate(_BATCH_EXECUTOR.map(job, req.configs)):
+            path = os.path.join(tmpdir, f"frame_{i:06d}.{req.format}")
+            with open(path, "wb") as f:
+                f.write(data)
+            frame_paths.append(path)
+    except Exception:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        raise
+    return frame_paths, tmpdir, (time.time() - start_time) * 1000
+
+
+# 滚动区段 PNG 缓存：key 为 (配置指纹, y_start, chunk_height)，值为 (PNG, 总高度)
+# 前端虚拟滚动来回拖动、组件重新挂载时会反复请求相同区段
+SCROLL_CHUNK_CACHE_SIZE = 64
+# 每次请求后预取上下相邻的区段数（每个方向），设为 0 关闭预取
+SCROLL_CHUNK_PREFETCH = int(os.getenv("SCROLL_CHUNK_PREFETCH", "1"))
+ChunkKey = Tuple[int, int, int]
+_scroll_chunk_cache: "OrderedDict[ChunkKey, Tuple[bytes, int]]" = OrderedDict()
+# 正在预取的区段：请求命中时等待其完成，避免同一区段渲染两次
+_scroll_chunk_pending: Dict[ChunkKey, Future] = {}
+_scroll_chunk_lock = threading.Lock()
+# 预取使用独立的小线程池，不占用处理请求的渲染线程；预取线程的滚动引擎与请求线程共用
+# 模块级的 SkPicture / 图块缓存，相邻区段直接由请求刚录制、光栅化好的 picture 和图块拼出
+_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+
+def _render_scroll_chunk_uncached(
+    config: RenderConfig,
+    chunk_key: ChunkKey,
+    total_height: Optional[int] = None,
+) -> Tuple[bytes, float, int]:
+    """渲染区段并写入缓存（total_height 已知时传入，不再重新计算总高度）"""
+    _, y_start, chunk_height = chunk_key
+    png_data, render_time, total_height = _get_scroll_engine().render_chunk_png(
+        config=config,
+        y_start=y_start,
+        chunk_height=chunk_height,
+        total_height=total_height,
+    )
+    if y_start >= total_height:
+        # 超出长图范围的空白区段由引擎按尺寸缓存同一份 PNG，不再按 y_start 逐个占用区段缓存
+        return png_data, render_time, total_height
+    with _scroll_chunk_lock:
+        _scroll_chunk_cache[chunk_key] = (png_data, total_height)
+        _scroll_chunk_cache.move_to_end(chunk_key)
+        while len(_scroll_chunk_cache) > SCROLL_CHUNK_CACHE_SIZE:
+            _scroll_chunk_cache.popitem(last=False)
+    return png_data, render_time, total_height
+
+
+def _render_scroll_chunk(config: RenderConfig, chunk_key: ChunkKey) -> Tuple[bytes, float, int]:
+    """渲染区段（带缓存；区段正在预取时等待预取结果）"""
+    start_time = time.time()
+    with _scroll_chunk_lock:
+        cached = _scroll_chunk_cache.get(chunk_key)
+        if cached is not None:
+            _scroll_chunk_cache.move_to_end(chunk_key)
+        pending = _scroll_chunk_pending.get(chunk_key) if cached is None else None
+    if pending is not None:
+        pending.result()
+        with _scroll_chunk_lock:
+            cached = _scroll_chunk_cache.get(chunk_key)
+    if cached is not None:
+        png_data, total_height = cached
+        return png_data, (time.time() - start_time) * 1000, total_height
+    return _render_scroll_chunk_uncached(config, chunk_key)
+
+
+def _prefetch_scroll_chunk(config: RenderConfig, chunk_key: ChunkKey, total_height: int):
+    try:
+        _render_scroll_chunk_uncached(config, chunk_key, total_height)
+    except Exception as e:
+        print(f"[预取] 区段 y_start={chunk_key[1]} 渲染失败: {e}")
+    finally:
+        with _scroll_chunk_lock:
+            _scroll_chunk_pending.pop(chunk_key, None)
+
+
+def _prefetch_scroll_neighbors(config: RenderConfig, key: int, y_start: int, chunk_height: int, total_height: int):
+    """在后台预取上下相邻的区段（只预取长画布范围内、未缓存且未在预取中的区段）"""
+    for k in range(1, SCROLL_CHUNK_PREFETCH + 1):
+        for y in (y_start + k * chunk_height, y_start - k * chunk_height):
+            if y < 0 or y >= total_height:
+                continue
+            chunk_key = (key, y, chunk_height)
+            with _scroll_chunk_lock:
+                if chunk_key in _scroll_chunk_cache or chunk_key in _scroll_chunk_pending:
+                    continue
+                _scroll_chunk_pending[chunk_key] = _PREFETCH_EXECUTOR.submit(
+                    _prefetch_scroll_chunk, config, chunk_key, total_height
+                )
+
+
+def _scroll_chunk_raw_job(payload: ScrollPreviewRequest):
+    key = payload.config.fingerprint()
+    png_data, render_time, total_height = _render_scroll_chunk(
+        payload.config, (key, payload.y_start, payload.chunk_height)
+    )
+    if SCROLL_CHUNK_PREFETCH > 0 and payload.chunk_height > 0:
+        _prefetch_scroll_neighbors(payload.config, key, payload.y_start, payload.chunk_height, total_height)
+    return png_data, render_time, total_height
+
+
+def _scroll_chunk_job(payload: ScrollPreviewRequest):
+    png_data, render_time, total_height = _scroll_chunk_raw_job(payload)
+    return _to_data_url(png_data), render_time, total_height
+
+
+def _scroll_full_raw_job(config: RenderConfig):
+    return _get_scroll_engine().render_full_png(config)
+
+
+def _scroll_full_job(config: RenderConfig):
+    png_data, render_time, total_height = _scroll_full_raw_job(config)
+    return _to_data_url(png_data), render_time, total_height
+
+
+class _ZipStreamBuffer(io.RawIOBase):
+    """
+    zipfile 的只写输出目标：暂存写入的数据，由生成器分块取出
+    不支持 seek/tell，zipfile 会自动切换到流式写法（data descriptor）
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+# ZIP 打包方式：TIFF 帧本身已经压缩，默认直接存储（stored），避免单线程 DEFLATE 成为导出瓶颈
+ZipCompression = Literal["stored", "deflate"]
+_ZIP_COMPRESSION = {
+    "stored": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+}
+
+
+def _iter_zip_stream(
+    frame_paths: List[str],
+    tmpdir: str,
+    compression: ZipCompression = "stored",
+) -> Iterator[bytes]:
+    """
+    逐帧打包 ZIP 并立即输出，内存占用为单帧量级而不是整个序列
+    打包结束（或客户端断开）后清理临时目录
+    """
+    buf = _ZipStreamBuffer()
+    try:
+        with zipfile.ZipFile(buf, "w", compression=_ZIP_COMPRESSION[compression]) as zf:
+            for p in frame_paths:
+                zf.write(p, arcname=os.path.basename(p))
+                yield buf.drain()
+        # 中央目录
+        yield buf.drain()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def _tiff_sequence_job(config: RenderConfig):
+    # 临时目录需要在流式响应结束后才删除，由 _iter_zip_stream 负责清理
+    tmpdir = tempfile.mkdtemp(dir=BASE_TEMP_DIR)
+    try:
+        frame_paths, render_time, total_height = _get_scroll_engine().render_tiff_sequence(
+            config=config,
+            output_dir=tmpdir,
+        )
+    except Exception:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        raise
+    return frame_paths, tmpdir, render_time, total_height
+
+
+def _tiff_sequence_fps_job(req: RenderSequenceRequest):
+    tmpdir = tempfile.mkdtemp(dir=BASE_TEMP_DIR)
+    try:
+        frame_paths, render_time, total_height, total_frames = _get_scroll_engine().render_tiff_sequence_timebased(
+            req=req,
+            output_dir=tmpdir,
+        )
+    except Exception:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        raise
+    return frame_paths, tmpdir, render_time, total_height, total_frames
+
+
+# 视频文件分块读取大小
+VIDEO_STREAM_CHUNK_SIZE = 1 << 20
+
+
+def _iter_file_stream(path: str, tmpdir: str) -> Iterator[bytes]:
+    """分块读取文件输出，结束（或客户端断开）后清理临时目录"""
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(VIDEO_STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def _video_fps_job(req: RenderSequenceRequest):
+    tmpdir = tempfile.mkdtemp(dir=BASE_TEMP_DIR)
+    video_path = os.path.join(tmpdir, "scroll.mp4")
+    try:
+        render_time, total_height, total_frames = _get_scroll_engine().render_video_stream(
+            req=req,
+            output_path=video_path,
+        )
+    except Exception:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        raise
+    return video_path, tmpdir, render_time, total_height, total_frames
 
 
 @app.get("/")
@@ -51,25 +442,85 @@ async def root():
 
 
 @app.post("/api/preview", response_model=PreviewResponse)
-async def get_preview(config: RenderConfig):
+async def get_preview(config: RenderConfig, request: Request, response: Response):
     """
     获取预览图像
     返回 PNG 格式的 base64 编码图像
     """
     try:
-        # 使用统一的渲染引擎
-        preview_data, render_time = render_engine.render_preview(config)
-        
-        # 转换为 base64
-        preview_base64 = base64.b64encode(preview_data).decode('utf-8')
-        preview_url = f"data:image/png;base64,{preview_base64}"
+        key = _config_digest(config)
+        etag = _preview_etag(key)
+        not_modified = _not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        # 使用统一的渲染引擎（在线程池中渲染并转换为 base64）
+        preview_url, render_time = await _run_in_executor(_preview_job, config, key)
         
+        response.headers.update(_cache_headers(etag))
         return PreviewResponse(
             preview_url=preview_url,
             render_time_ms=render_time
         )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
+            status_code=500,
+            content={"error": str(e)}
+        )
+
+
+@app.post("/api/preview/raw")
+async def get_preview_raw(config: RenderConfig, request: Request):
+    """
+    获取预览图像（原始 PNG；PREVIEW_IMAGE_FORMAT=jpeg 时为 JPEG）
+    直接返回图像（Content-Type 为 PREVIEW_MIME_TYPE），不做 base64/JSON 封装，渲染耗时放在 X-Render-Time-Ms 响应头中
+    """
+    try:
+        key = _config_digest(config)
+        etag = _preview_etag(key)
+        not_modified = _not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        preview_data, render_time = await _run_in_executor(_preview_raw_job, config, key)
+
+        return Response(
+            content=preview_data,
+            media_type=PREVIEW_MIME_TYPE,
+            headers={"X-Render-Time-Ms": str(render_time), **_cache_headers(etag)},
+        )
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=500,
+            content={"error": str(e)}
+        )
+
+
+@app.post("/api/preview/fast")
+async def get_preview_fast(request: Request):
+    """
+    获取预览图像（原始 PNG/JPEG，快速路径）
+    供可信的前端使用：请求体直接 orjson 解析，跳过 RenderConfig 的 Pydantic 校验；
+    缓存 key 直接取请求体摘要，无需重新序列化配置
+    """
+    try:
+        body = await request.body()
+        key = _body_digest(body)
+        etag = _preview_etag(key)
+        not_modified = _not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        config = RenderConfig.construct_trusted(orjson.loads(body))
+        preview_data, render_time = await _run_in_executor(_preview_raw_job, config, key)
+
+        return Response(
+            content=preview_data,
+            media_type=PREVIEW_MIME_TYPE,
+            headers={"X-Render-Time-Ms": str(render_time), **_cache_headers(etag)},
+        )
+    except Exception as e:
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -82,7 +533,7 @@ async def render_dpx(config: RenderConfig):
     返回 DPX 格式的文件
     """
     try:
-        dpx_data, render_time = render_engine.render_final_dpx(config)
+        dpx_data, render_time = await _run_in_executor(_render_dpx_job, config)
         
         return Response(
             content=dpx_data,
@@ -93,7 +544,7 @@ async def render_dpx(config: RenderConfig):
             }
         )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -106,7 +557,7 @@ async def render_tiff(config: RenderConfig):
     返回 TIFF 格式的文件
     """
     try:
-        tiff_data, render_time = render_engine.render_final_tiff(config)
+        tiff_data, render_time = await _run_in_executor(_render_tiff_job, config)
         
         return Response(
             content=tiff_data,
@@ -117,7 +568,7 @@ async def render_tiff(config: RenderConfig):
             }
         )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -135,14 +586,7 @@ async def get_scroll_chunk(payload: ScrollPreviewRequest):
     获取全分辨率滚动预览的区段 PNG
     """
     try:
-        png_data, render_time, total_height = scroll_engine.render_chunk_png(
-            config=payload.config,
-            y_start=payload.y_start,
-            chunk_height=payload.chunk_height,
-            total_height=None,
-        )
-        preview_base64 = base64.b64encode(png_data).decode("utf-8")
-        preview_url = f"data:image/png;base64,{preview_base64}"
+        preview_url, render_time, total_height = await _run_in_executor(_scroll_chunk_job, payload)
         return ScrollPreviewResponse(
             preview_url=preview_url,
             render_time_ms=render_time,
@@ -151,105 +595,193 @@ async def get_scroll_chunk(payload: ScrollPreviewRequest):
             chunk_height=payload.chunk_height,
         )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
+            status_code=500,
+            content={"error": str(e)},
+        )
+
+
+@app.post("/api/preview/scroll-chunk/raw")
+async def get_scroll_chunk_raw(payload: ScrollPreviewRequest):
+    """
+    获取全分辨率滚动预览的区段 PNG（原始 PNG，总高度放在 X-Total-Height 响应头中）
+    """
+    try:
+        png_data, render_time, total_height = await _run_in_executor(_scroll_chunk_raw_job, payload)
+        return Response(
+            content=png_data,
+            media_type="image/png",
+            headers={
+                "X-Render-Time-Ms": str(render_time),
+                "X-Total-Height": str(total_height),
+            },
+        )
+    except Exception as e:
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)},
         )
 
 
 @app.post("/api/preview/scroll-full", response_model=ScrollFullPreviewResponse)
-async def get_scroll_full(config: RenderConfig):
+async def get_scroll_full(config: RenderConfig, request: Request, response: Response):
     """
     获取全分辨率长图（一次性渲染，不做分块），用于前端本地滚动预览
     """
     try:
-        png_data, render_time, total_height = scroll_engine.render_full_png(config)
-        preview_base64 = base64.b64encode(png_data).decode("utf-8")
-        preview_url = f"data:image/png;base64,{preview_base64}"
+        etag = _preview_etag(_config_digest(config))
+        not_modified = _not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        preview_url, render_time, total_height = await _run_in_executor(_scroll_full_job, config)
+        response.headers.update(_cache_headers(etag))
         return ScrollFullPreviewResponse(
             preview_url=preview_url,
             render_time_ms=render_time,
             total_height=total_height,
         )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
+            status_code=500,
+            content={"error": str(e)},
+        )
+
+
+@app.post("/api/preview/scroll-full/raw")
+async def get_scroll_full_raw(config: RenderConfig, request: Request):
+    """
+    获取全分辨率长图（原始 PNG，总高度放在 X-Total-Height 响应头中）
+    """
+    try:
+        etag = _preview_etag(_config_digest(config))
+        not_modified = _not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        png_data, render_time, total_height = await _run_in_executor(_scroll_full_raw_job, config)
+        return Response(
+            content=png_data,
+            media_type="image/png",
+            headers={
+                "X-Render-Time-Ms": str(render_time),
+                "X-Total-Height": str(total_height),
+                **_cache_headers(etag),
+            },
+        )
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=500,
+            content={"error": str(e)},
+        )
+
+
+@app.post("/api/render/batch")
+async def render_batch(req: RenderBatchRequest, compression: ZipCompression = "stored"):
+    """
+    批量渲染多帧成片（DPX/TIFF），各帧在线程池中并行渲染，打包 ZIP 返回
+    - compression: ZIP 打包方式（查询参数），同 /api/render/tiff-seq
+    """
+    try:
+        frame_paths, tmpdir, render_time = await _run_in_executor(_render_batch_job, req)
+
+        return StreamingResponse(
+            _iter_zip_stream(frame_paths, tmpdir, compression),
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": f"attachment; filename={req.format}_batch.zip",
+                "X-Render-Time-Ms": str(render_time),
+                "X-Frame-Count": str(len(frame_paths)),
+            },
+        )
+    except Exception as e:
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)},
         )
 
 
 @app.post("/api/render/tiff-seq")
-async def render_tiff_sequence(config: RenderConfig):
+async def render_tiff_sequence(config: RenderConfig, compression: ZipCompression = "stored"):
     """
     渲染长画布为 TIFF 序列并打包 ZIP 返回
+    - compression: ZIP 打包方式（查询参数），stored=直接存储（默认），deflate=DEFLATE 压缩
     """
     try:
-        with tempfile.TemporaryDirectory(dir=BASE_TEMP_DIR) as tmpdir:
-            frame_paths, render_time, total_height = scroll_engine.render_tiff_sequence(
-                config=config,
-                output_dir=tmpdir,
-            )
-
-            zip_path = os.path.join(tmpdir, "tiff_sequence.zip")
-            with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-                for p in frame_paths:
-                    zf.write(p, arcname=os.path.basename(p))
-
-            with open(zip_path, "rb") as f:
-                data = f.read()
-
-            return Response(
-                content=data,
-                media_type="application/zip",
-                headers={
-                    "Content-Disposition": "attachment; filename=tiff_sequence.zip",
-                    "X-Render-Time-Ms": str(render_time),
-                    "X-Total-Height": str(total_height),
-                    "X-Frame-Count": str(len(frame_paths)),
-                },
-            )
+        frame_paths, tmpdir, render_time, total_height = await _run_in_executor(_tiff_sequence_job, config)
+
+        return StreamingResponse(
+            _iter_zip_stream(frame_paths, tmpdir, compression),
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": "attachment; filename=tiff_sequence.zip",
+                "X-Render-Time-Ms": str(render_time),
+                "X-Total-Height": str(total_height),
+                "X-Frame-Count": str(len(frame_paths)),
+            },
+        )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)},
         )
 
 
 @app.post("/api/render/tiff-seq-fps")
-async def render_tiff_sequence_fps(req: RenderSequenceRequest):
+async def render_tiff_sequence_fps(req: RenderSequenceRequest, compression: ZipCompression = "stored"):
     """
     基于 FPS/时长/速度 的逐帧渲染，输出 TIFF 序列 ZIP
+    - compression: ZIP 打包方式（查询参数），同 /api/render/tiff-seq
     """
     try:
-        with tempfile.TemporaryDirectory(dir=BASE_TEMP_DIR) as tmpdir:
-            frame_paths, render_time, total_height, total_frames = scroll_engine.render_tiff_sequence_timebased(
-                req=req,
-                output_dir=tmpdir,
-            )
-
-            zip_path = os.path.join(tmpdir, "tiff_sequence.zip")
-            with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-                for p in frame_paths:
-                    zf.write(p, arcname=os.path.basename(p))
-
-            with open(zip_path, "rb") as f:
-                data = f.read()
-
-            return Response(
-                content=data,
-                media_type="application/zip",
-                headers={
-                    "Content-Disposition": "attachment; filename=tiff_sequence.zip",
-                    "X-Render-Time-Ms": str(render_time),
-                    "X-Total-Height": str(total_height),
-                    "X-Frame-Count": str(len(frame_paths)),
-                    "X-Fps": str(req.fps),
-                    "X-Total-Frames": str(total_frames),
-                },
-            )
+        frame_paths, tmpdir, render_time, total_height, total_frames = await _run_in_executor(
+            _tiff_sequence_fps_job, req
+        )
+
+        return StreamingResponse(
+            _iter_zip_stream(frame_paths, tmpdir, compression),
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": "attachment; filename=tiff_sequence.zip",
+                "X-Render-Time-Ms": str(render_time),
+                "X-Total-Height": str(total_height),
+                "X-Frame-Count": str(len(frame_paths)),
+                "X-Fps": str(req.fps),
+                "X-Total-Frames": str(total_frames),
+            },
+        )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)},
         )
 
+
+@app.post("/api/render/video-fps")
+async def render_video_fps(req: RenderSequenceRequest):
+    """
+    基于 FPS/时长/速度 的逐帧渲染，帧像素直接送入 ffmpeg 编码，返回 MP4（H.264）
+    参数与 /api/render/tiff-seq-fps 相同，不生成中间 TIFF 文件
+    """
+    try:
+        video_path, tmpdir, render_time, total_height, total_frames = await _run_in_executor(
+            _video_fps_job, req
+        )
+
+        return StreamingResponse(
+            _iter_file_stream(video_path, tmpdir),
+            media_type="video/mp4",
+            headers={
+                "Content-Disposition": "attachment; filename=scroll.mp4",
+                "Content-Length": str(os.path.getsize(video_path)),
+                "X-Render-Time-Ms": str(render_time),
+                "X-Total-Height": str(total_height),
+                "X-Fps": str(req.fps),
+                "X-Total-Frames": str(total_frames),
+            },
+        )
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=500,
+            content={"error": str(e)},
+        )
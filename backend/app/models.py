@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional, Tuple
+from typing import List, Literal, Optional, Tuple
 
 
 class SubtitleItem(BaseModel):
@@ -27,6 +27,36 @@ class RenderConfig(BaseModel):
     ensure_no_scroll: Optional[bool] = False  # 确保没有抖动（开启 Baseline Snapping 和 Hinting）
     optimization_mode: Optional[str] = None  # 优化模式，'duration' 时长优先，'layout' 排版优先
 
+    @classmethod
+    def construct_trusted(cls, data: dict) -> "RenderConfig":
+        """
+        跳过校验直接构建配置（仅用于可信的前端请求体）
+        字幕很多时逐字段校验是 O(n_subtitles) 的 Python 开销，这里只构建嵌套对象
+        """
+        subtitles = [SubtitleItem.model_construct(**s) for s in data.get("subtitles", [])]
+        return cls.model_construct(**{**data, "subtitles": subtitles})
+
+    def fingerprint(self) -> int:
+        """
+        配置内容的指纹（进程内稳定），用作渲染缓存键：
+        Pydantic 每个请求都会重建配置对象，按 id 缓存无法跨请求命中；内容相同则指纹相同，编辑后自然得到新指纹
+        不包含字幕 id（不影响渲染结果）；比序列化为 JSON 再求摘要快得多
+        """
+        return hash((
+            self.width,
+            self.height,
+            tuple(self.background_color),
+            self.preview,
+            self.preview_scale,
+            self.ensure_no_scroll,
+            self.optimization_mode,
+            tuple(
+                (s.x, s.y, s.font_size, s.line_height, s.letter_spacing, tuple(s.color),
+                 s.font_family, s.font_family_cn, s.text)
+                for s in self.subtitles
+            ),
+        ))
+
 
 class PreviewResponse(BaseModel):
     """预览响应"""
@@ -72,3 +102,13 @@ class RenderSequenceRequest(BaseModel):
     scroll_speed: Optional[float] = None
     ensure_no_scroll: Optional[bool] = False
     optimization_mode: Optional[str] = None  # 'duration' or 'layout'
+
+
+class RenderBatchRequest(BaseModel):
+    """
+    批量成片渲染请求：
+    - configs: 每帧一个渲染配置
+    - format: 输出格式，'dpx' 或 'tiff'
+    """
+    configs: List[RenderConfig]
+    format: Literal["dpx", "tiff"] = "dpx"
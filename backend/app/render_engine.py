@@ -6,24 +6,71 @@
 3. 最终输出：Pillow -> OIIO -> DPX
 这样可以保证预览和最终渲染使用相同的文本渲染逻辑，确保一致性
 """
+import math
 import time
 import platform
 import tempfile
 import os
+from collections import OrderedDict
 from io import BytesIO
 from typing import List, Tuple, Optional
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 import OpenImageIO as oiio
 
+try:
+    import skia
+except ImportError:  # skia-python 是可选依赖，仅用于预览 PNG 编码
+    skia = None
+
 from app.models import SubtitleItem, RenderConfig
+from app.text_segments import CJK_RANGES, SCRIPT_RUN_RE
+
+# OIIO 的 Python 绑定不支持写入内存（IOProxy），编码时的临时文件优先放在内存文件系统中，
+# 避免落盘；没有 /dev/shm 的平台使用系统默认临时目录
+OIIO_TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# 预览 PNG 的 zlib 压缩级别（0-9）：预览图只是临时展示，默认用最快的 1 级，编码耗时远低于默认的 6 级
+PREVIEW_PNG_LEVEL = int(os.getenv("PREVIEW_PNG_LEVEL", "1"))
+# 预览 PNG 编码器：pillow（默认，使用上面的压缩级别）或 skia（libpng，需要安装 skia-python）
+# skia-python 不能指定 zlib 级别，是否更快取决于画面内容，因此需要显式开启
+PREVIEW_PNG_ENCODER = os.getenv("PREVIEW_PNG_ENCODER", "pillow")
+
+# 字体对象缓存条目上限（按字体、字号、是否中文区分），超过后淘汰最久未用的条目，长时间运行不会无限增长
+FONT_CACHE_SIZE = int(os.getenv("FONT_CACHE_SIZE", "128"))
+# 字形图集、逐字符度量缓存的条目上限（每种字体的字符数），超过后淘汰最久未用的条目
+GLYPH_CACHE_SIZE = int(os.getenv("GLYPH_CACHE_SIZE", "8192"))
+# 字间距逐字贴图的亚像素精度：x 坐标量化到 1/SUBPIXEL_STEPS 像素，每个相位按需光栅化一份字形蒙版；
+# 取 64 与 FreeType 的 26.6 定点精度一致，贴图结果与 draw.text 在同一浮点位置的亚像素渲染逐字节一致
+SUBPIXEL_STEPS = 64
+
+
+def _write_oiio_image(path: str, spec, pixels: np.ndarray):
+    """
+    用 OIIO ImageOutput 直接从像素数组写出图像文件（格式由扩展名决定），失败时抛出 RuntimeError
+    不再先 set_pixels 复制进 ImageBuf 再写出，省去一次整帧拷贝
+    """
+    out = oiio.ImageOutput.create(path)
+    if out is None:
+        raise RuntimeError(f"无法创建图像输出 {path}: {oiio.geterror()}")
+    try:
+        if not out.open(path, spec) or not out.write_image(pixels):
+            raise RuntimeError(f"写入图像失败 {path}: {out.geterror()}")
+    finally:
+        out.close()
 
 
 class RenderEngine:
     """统一的渲染引擎"""
     
     def __init__(self):
-        self.font_cache = {}
+        self.font_cache = OrderedDict()
+        # 逐字符度量缓存：(font_family, font_size, is_chinese) -> {char: (各亚像素相位的预渲染字形列表或 None, advance width)}
+        # 字间距渲染时每个字符只需一次字典查找即可取到字形和字宽；
+        # 外层最多 FONT_CACHE_SIZE 种字体、每种字体最多 GLYPH_CACHE_SIZE 个字符，均按 LRU 淘汰
+        self.metrics_cache: "OrderedDict[Tuple[str, int, bool], OrderedDict[str, Tuple[Optional[List[Optional[Tuple[Image.Image, Tuple[int, int]]]]], float]]]" = OrderedDict()
+        # 字形图集：((font_family, font_size, is_chinese), char, 相位) -> (灰度字形蒙版, 相对原点的偏移)，最多 GLYPH_CACHE_SIZE 条，按 LRU 淘汰
+        self.glyph_atlas: "OrderedDict[Tuple[Tuple[str, int, bool], str, int], Optional[Tuple[Image.Image, Tuple[int, int]]]]" = OrderedDict()
         self._init_default_fonts()
     
     def _init_default_fonts(self):
@@ -75,7 +122,7 @@ class RenderEngine:
     
     def get_font(self, font_family: str, font_size: int, is_chinese: bool = False):
         """获取字体（带缓存）"""
-        cache_key = f"{font_family}_{font_size}_{is_chinese}"
+        cache_key = (font_family, font_size, is_chinese)
         if cache_key not in self.font_cache:
             try:
                 # 尝试加载指定字体
@@ -99,11 +146,64 @@ class RenderEngine:
                     else:
                         font = ImageFont.load_default()
             self.font_cache[cache_key] = font
+            while len(self.font_cache) > FONT_CACHE_SIZE:
+                self.font_cache.popitem(last=False)
+            return font
+        self.font_cache.move_to_end(cache_key)
         return self.font_cache[cache_key]
     
+    def get_glyph(self, metrics_key: Tuple[str, int, bool], char: str, phase: int = 0):
+        """
+        获取单个字符在亚像素相位 phase（x 小数部分为 phase / SUBPIXEL_STEPS）下的预渲染字形（带缓存）
+        返回 (L 模式蒙版, 相对整数像素原点的偏移)，空白字符返回 None
+        """
+        atlas_key = (metrics_key, char, phase)
+        if atlas_key in self.glyph_atlas:
+            self.glyph_atlas.move_to_end(atlas_key)
+            return self.glyph_atlas[atlas_key]
+
+        font = self.get_font(*metrics_key)
+        left, top, right, bottom = font.getbbox(char)
+        if right <= left or bottom <= top:
+            glyph = None
+        else:
+            # 左侧留出 pad 列使绘制起点非负、小数部分恰为相位（draw.text 按起点的小数部分做亚像素渲染），
+            # 右侧多留 1 列容纳相位带来的右移
+            pad = max(0, -left)
+            mask = Image.new("L", (pad + right + 1, bottom - top), 0)
+            ImageDraw.Draw(mask).text((pad + phase / SUBPIXEL_STEPS, -top), char, fill=255, font=font)
+            glyph = (mask, (-pad, top))
+        self.glyph_atlas[atlas_key] = glyph
+        while len(self.glyph_atlas) > GLYPH_CACHE_SIZE:
+            self.glyph_atlas.popitem(last=False)
+        return glyph
+    
+    def _char_metrics(self, metrics_key: Tuple[str, int, bool]) -> "OrderedDict":
+        """获取指定字体的逐字符度量缓存（按字体 LRU，最多 FONT_CACHE_SIZE 种字体）"""
+        chars = self.metrics_cache.get(metrics_key)
+        if chars is None:
+            chars = self.metrics_cache[metrics_key] = OrderedDict()
+            while len(self.metrics_cache) > FONT_CACHE_SIZE:
+                self.metrics_cache.popitem(last=False)
+        else:
+            self.metrics_cache.move_to_end(metrics_key)
+        return chars
+    
+    def _new_canvas(self, config: RenderConfig) -> Image.Image:
+        """创建填充好背景色的画布"""
+        return Image.new("RGB", (config.width, config.height), tuple(config.background_color))
+    
     def is_chinese_char(self, char: str) -> bool:
         """判断字符是否为中文"""
-        return '\u4e00' <= char <= '\u9fff'
+        cp = ord(char)
+        return any(lo <= cp <= hi for lo, hi in CJK_RANGES)
+    
+    def split_script_runs(self, line: str) -> List[Tuple[str, bool]]:
+        """
+        将一行文本切分为中/英文连续段，返回 [(段落, 是否中文)]
+        使用预编译正则一次扫描整行，只在段边界处产生切片
+        """
+        return [(m.group(), m.lastgroup == "cn") for m in SCRIPT_RUN_RE.finditer(line)]
     
     def render_preview(self, config: RenderConfig) -> Tuple[bytes, float]:
         """
@@ -113,7 +213,7 @@ class RenderEngine:
         start_time = time.time()
         
         # 创建图像
-        img = Image.new('RGB', (config.width, config.height), config.background_color)
+        img = self._new_canvas(config)
         draw = ImageDraw.Draw(img)
         
         # 渲染每个字幕
@@ -121,13 +221,23 @@ class RenderEngine:
             self._render_subtitle(draw, subtitle, config.width, config.height)
         
         # 转换为 PNG
-        output = BytesIO()
-        img.save(output, format='PNG')
-        output.seek(0)
+        png_data = self._encode_preview_png(img)
         
         render_time = (time.time() - start_time) * 1000  # 转换为毫秒
         
-        return output.read(), render_time
+        return png_data, render_time
+    
+    def _encode_preview_png(self, img: Image.Image) -> bytes:
+        """编码预览 PNG：按 PREVIEW_PNG_ENCODER 选择 Skia 或 Pillow，Skia 不可用时回退到 Pillow"""
+        if PREVIEW_PNG_ENCODER == "skia" and skia is not None:
+            # Skia 需要 4 通道像素，alpha 固定为不透明
+            pixels = np.asarray(img.convert("RGBA"))
+            image = skia.Image.fromarray(pixels, colorType=skia.ColorType.kRGBA_8888_ColorType)
+            return bytes(image.encodeToData(skia.EncodedImageFormat.kPNG, 100))
+        
+        output = BytesIO()
+        img.save(output, format='PNG', compress_level=PREVIEW_PNG_LEVEL)
+        return output.getvalue()
     
     def render_final_dpx(self, config: RenderConfig) -> Tuple[bytes, float]:
         """
@@ -137,19 +247,19 @@ class RenderEngine:
         start_time = time.time()
         
         # 创建图像（使用与预览相同的逻辑）
-        img = Image.new('RGB', (config.width, config.height), config.background_color)
+        img = self._new_canvas(config)
         draw = ImageDraw.Draw(img)
         
         # 渲染每个字幕（使用相同的函数，确保一致性）
         for subtitle in config.subtitles:
             self._render_subtitle(draw, subtitle, config.width, config.height)
         
-        # 转换为 numpy 数组
-        img_array = np.array(img, dtype=np.uint8)
+        # 转换为 numpy 数组（RGB 模式下已是 (height, width, 3) 的 uint8，无需再转换/reshape）
+        img_array = np.asarray(img)
         
         # 使用 OIIO 保存为 DPX 格式
         # 创建临时文件
-        with tempfile.NamedTemporaryFile(suffix='.dpx', delete=False) as tmp_file:
+        with tempfile.NamedTemporaryFile(suffix='.dpx', dir=OIIO_TEMP_DIR, delete=False) as tmp_file:
             tmp_path = tmp_file.name
         
         try:
@@ -157,16 +267,8 @@ class RenderEngine:
             spec = oiio.ImageSpec(config.width, config.height, 3, oiio.UINT8)
             spec.attribute("oiio:BitsPerSample", 8)  # DPX 支持 8, 10, 12, 16 bit
             
-            # 创建 ImageBuf
-            buf = oiio.ImageBuf(spec)
-            
-            # 设置像素数据（OIIO 使用 (height, width, channels) 格式）
-            # 注意：需要转换维度顺序
-            img_reshaped = img_array.reshape((config.height, config.width, 3))
-            buf.set_pixels(oiio.ROI(0, config.width, 0, config.height, 0, 1, 0, 3), img_reshaped)
-            
-            # 写入 DPX 文件
-            buf.write(tmp_path)
+            # 写入 DPX 文件（ImageOutput 直接从 (height, width, channels) 像素数组写出，不经过 ImageBuf）
+            _write_oiio_image(tmp_path, spec, img_array)
             
             # 读取文件内容
             with open(tmp_path, 'rb') as f:
@@ -188,34 +290,27 @@ class RenderEngine:
         start_time = time.time()
         
         # 创建图像（使用与预览相同的逻辑）
-        img = Image.new('RGB', (config.width, config.height), config.background_color)
+        img = self._new_canvas(config)
         draw = ImageDraw.Draw(img)
         
         # 渲染每个字幕（使用相同的函数，确保一致性）
         for subtitle in config.subtitles:
             self._render_subtitle(draw, subtitle, config.width, config.height)
         
-        # 转换为 numpy 数组
-        img_array = np.array(img, dtype=np.uint8)
+        # 转换为 numpy 数组（RGB 模式下已是 (height, width, 3) 的 uint8，无需再转换/reshape）
+        img_array = np.asarray(img)
         
         # 使用 OIIO 保存为 TIFF 格式
         # 创建临时文件
-        with tempfile.NamedTemporaryFile(suffix='.tiff', delete=False) as tmp_file:
+        with tempfile.NamedTemporaryFile(suffix='.tiff', dir=OIIO_TEMP_DIR, delete=False) as tmp_file:
             tmp_path = tmp_file.name
         
         try:
             # 创建 OIIO ImageSpec
             spec = oiio.ImageSpec(config.width, config.height, 3, oiio.UINT8)
             
-            # 创建 ImageBuf
-            buf = oiio.ImageBuf(spec)
-            
-            # 设置像素数据
-            img_reshaped = img_array.reshape((config.height, config.width, 3))
-            buf.set_pixels(oiio.ROI(0, config.width, 0, config.height, 0, 1, 0, 3), img_reshaped)
-            
-            # 写入 TIFF 文件
-            buf.write(tmp_path)
+            # 写入 TIFF 文件（ImageOutput 直接从像素数组写出）
+            _write_oiio_image(tmp_path, spec, img_array)
             
             # 读取文件内容
             with open(tmp_path, 'rb') as f:
@@ -236,6 +331,22 @@ class RenderEngine:
         这是核心渲染逻辑，预览和最终渲染都使用这个方法
         支持中英文字体分离
         """
+        # 空白字幕（间隔占位）没有可绘制的内容，直接返回，不加载字体、不分行
+        if not subtitle.text.strip():
+            return
+        
+        # 每个字幕只解析一次字体和缓存，内层循环直接复用
+        en_key = (subtitle.font_family, subtitle.font_size, False)
+        font_en = self.get_font(*en_key)
+        # 未指定中文字体时：分段渲染回退到默认中文字体，逐字符渲染沿用英文字体
+        font_cn = self.get_font(subtitle.font_family_cn, subtitle.font_size, is_chinese=True)
+        if subtitle.font_family_cn:
+            spaced_cn_key = (subtitle.font_family_cn, subtitle.font_size, True)
+            spaced_font_cn = font_cn
+        else:
+            spaced_cn_key = en_key
+            spaced_font_cn = font_en
+        
         # 处理多行文本
         lines = subtitle.text.split('\n')
         y_offset = subtitle.y
@@ -248,70 +359,60 @@ class RenderEngine:
             # 处理字间距
             if subtitle.letter_spacing != 0:
                 # 逐字符渲染以实现字间距和中英文字体分离
+                chars_en = self._char_metrics(en_key)
+                chars_cn = self._char_metrics(spaced_cn_key)
+                # 循环内不变的量提到循环外
+                letter_spacing = subtitle.letter_spacing
+                color = subtitle.color
+                y_pixel = int(round(y_offset))
                 x_offset = subtitle.x
-                for char in line:
-                    # 根据字符类型选择字体
-                    is_cn = self.is_chinese_char(char)
-                    if is_cn and subtitle.font_family_cn:
-                        font = self.get_font(subtitle.font_family_cn, subtitle.font_size, is_chinese=True)
+                # 整行先按中英文连续段切分（正则扫描，C 实现），字体按段选择，不再逐字符判断字符类型
+                for segment, is_cn in self.split_script_runs(line):
+                    if is_cn:
+                        metrics_key, font, chars = spaced_cn_key, spaced_font_cn, chars_cn
                     else:
-                        font = self.get_font(subtitle.font_family, subtitle.font_size, is_chinese=False)
+                        metrics_key, font, chars = en_key, font_en, chars_en
                     
-                    draw.text(
-                        (x_offset, y_offset),
-                        char,
-                        fill=subtitle.color,
-                        font=font
-                    )
-                    # 获取字符宽度并添加字间距
-                    char_bbox = draw.textbbox((0, 0), char, font=font)
-                    char_width = char_bbox[2] - char_bbox[0]
-                    x_offset += char_width + subtitle.letter_spacing
+                    for char in segment:
+                        # 字形每个亚像素相位只渲染一次，之后按偏移贴图（避免逐字符 draw.text 重复光栅化）；
+                        # 各相位字形（空白字符为 None）和字宽（水平 advance）按字体缓存在同一条目中
+                        entry = chars.get(char)
+                        if entry is None:
+                            glyph = self.get_glyph(metrics_key, char)
+                            phases = None if glyph is None else [glyph] + [None] * (SUBPIXEL_STEPS - 1)
+                            entry = chars[char] = (phases, font.getlength(char))
+                            if len(chars) > GLYPH_CACHE_SIZE:
+                                chars.popitem(last=False)
+                        else:
+                            chars.move_to_end(char)
+                        phases, char_width = entry
+                        if phases is not None:
+                            # x 量化到 1/SUBPIXEL_STEPS 像素：整数部分定位贴图，小数部分选择对应相位的字形
+                            x_pixel, phase = divmod(math.floor(x_offset * SUBPIXEL_STEPS + 0.5), SUBPIXEL_STEPS)
+                            glyph = phases[phase]
+                            if glyph is None:
+                                glyph = phases[phase] = self.get_glyph(metrics_key, char, phase)
+                            mask, (dx, dy) = glyph
+                            draw.bitmap(
+                                (x_pixel + dx, y_pixel + dy),
+                                mask,
+                                fill=color
+                            )
+                        x_offset += char_width + letter_spacing
             else:
                 # 正常渲染（无字间距，但需要处理中英文字体分离）
-                # 将文本按中英文分组
+                # 将文本按中英文分组，每段只绘制一次
                 x_offset = subtitle.x
-                current_segment = ""
-                current_is_cn = None
-                
-                for char in line:
-                    is_cn = self.is_chinese_char(char)
-                    
-                    # 如果字符类型改变，先渲染之前的段落
-                    if current_is_cn is not None and is_cn != current_is_cn:
-                        if current_segment:
-                            font = self.get_font(
-                                subtitle.font_family_cn if current_is_cn else subtitle.font_family,
-                                subtitle.font_size,
-                                is_chinese=current_is_cn
-                            )
-                            draw.text(
-                                (x_offset, y_offset),
-                                current_segment,
-                                fill=subtitle.color,
-                                font=font
-                            )
-                            # 计算已渲染文本的宽度
-                            bbox = draw.textbbox((0, 0), current_segment, font=font)
-                            x_offset += bbox[2] - bbox[0]
-                        current_segment = ""
-                    
-                    current_segment += char
-                    current_is_cn = is_cn
-                
-                # 渲染最后一段
-                if current_segment:
-                    font = self.get_font(
-                        subtitle.font_family_cn if current_is_cn else subtitle.font_family,
-                        subtitle.font_size,
-                        is_chinese=current_is_cn if current_is_cn is not None else False
-                    )
+                for segment, is_cn in self.split_script_runs(line):
+                    font = font_cn if is_cn else font_en
                     draw.text(
                         (x_offset, y_offset),
-                        current_segment,
+                        segment,
                         fill=subtitle.color,
                         font=font
                     )
+                    # 计算已渲染文本的宽度（水平 advance）
+                    x_offset += font.getlength(segment)
             
             # 移动到下一行
             y_offset += int(subtitle.font_size * subtitle.line_height)
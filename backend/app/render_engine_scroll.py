@@ -5,108 +5,191 @@
 - 将整条字幕渲染在同一超长画布上，用于垂直滚动预览/播放
 - 提供按 y 区段（chunk）获取 PNG 图块的能力，便于前端按需加载
 - 支持导出序列帧（TIFF 序列），便于前端整体下载
+- 支持将逐帧像素直接送入 ffmpeg 编码为视频（不落地 TIFF）
 
 特点：
 - 文本渲染沿用 Skia，与最终输出保持一致的排版/抗锯齿效果
 - 支持计算总高度，避免“超出画面被裁剪”的问题
 - 按区段渲染，方便前端实现虚拟滚动或按时间拉取对应切片
 """
+import io
 import math
+import multiprocessing
 import os
+import queue
+import subprocess
+import tempfile
+import threading
 import time
-import platform
-from typing import Tuple, Optional, List
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple, Tuple, Optional, List
 
 import numpy as np
 import skia
 import OpenImageIO as oiio
 
+try:
+    import pymtpng
+except ImportError:  # 可选依赖：多线程 PNG 编码器，未安装时使用 Skia 自带的单线程编码器
+    pymtpng = None
+
 from app.models import RenderConfig, SubtitleItem, RenderSequenceRequest
+from app.render_engine_skia import (
+    MEASURE_CACHE_SIZE,
+    GlyphRun,
+    load_typeface,
+    resolve_default_fonts,
+    segment_runs,
+    shape_run,
+    write_oiio_image,
+)
 
 # 默认临时目录：项目根目录下的 temp
 BASE_TEMP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "temp"))
 os.makedirs(BASE_TEMP_DIR, exist_ok=True)
 
+# 序列帧多进程渲染：帧数较少时进程启动开销大于收益，直接在当前进程渲染
+SEQUENCE_PARALLEL_MIN_FRAMES = 16
+# 工作进程数，默认使用全部 CPU 核心；设为 1 可关闭多进程渲染
+SEQUENCE_WORKERS = int(os.getenv("SCROLL_RENDER_WORKERS", "0")) or (os.cpu_count() or 1)
+# 工作进程启动方式：不使用 fork。服务进程中有多个渲染线程池，fork 时若其他线程正持有锁（如 Skia 字形缓存锁），
+# 子进程会继承一把永远不会释放的锁，绘制文字时死锁；forkserver/spawn 从干净的进程启动，
+# picture 已经序列化后经 initializer 传入，不依赖 fork 继承的内存
+_SEQUENCE_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+# 逐帧调试输出（每帧 y_start 日志、相邻帧像素比对），比对需要整帧做差，默认关闭；设为 1 开启
+SEQUENCE_DEBUG = os.getenv("SCROLL_RENDER_DEBUG", "0") == "1"
+# 整条字幕的 SkPicture 缓存条目数（每个配置 + 字体模式一条）
+PICTURE_CACHE_SIZE = 8
+# 序列帧 TIFF 压缩方式（lzw / zip / none），默认 lzw：写入比 zip 快，体积仍小于不压缩
+SEQUENCE_TIFF_COMPRESSION = os.getenv("SEQUENCE_TIFF_COMPRESSION", "lzw")
+# 单进程渲染序列帧时，绘制与 TIFF 写出分别在两个线程中流水进行；写出队列中最多暂存的帧数
+SEQUENCE_WRITE_QUEUE_SIZE = 2
+# 单进程渲染序列帧时的 TIFF 写出线程数（OIIO 编码/落盘释放 GIL，可在多核上并行），默认最多 4 个
+SEQUENCE_WRITE_THREADS = int(os.getenv("SCROLL_WRITE_THREADS", "0")) or min(4, os.cpu_count() or 1)
+# 字体对象缓存条目上限（按字体、字号、字体模式区分），超过后淘汰最久未用的条目，长时间运行不会无限增长
+FONT_CACHE_SIZE = int(os.getenv("FONT_CACHE_SIZE", "128"))
+
+# 视频流输出：ffmpeg 可执行文件与编码器（H.264，yuv420p 以兼容常见播放器）
+FFMPEG_BIN = os.getenv("FFMPEG_BIN", "ffmpeg")
+VIDEO_CODEC = os.getenv("SCROLL_VIDEO_CODEC", "libx264")
+
+# GPU 渲染（实验性）：设为 1 时尝试用 GrDirectContext 创建 GPU 表面，失败时回退到 CPU 光栅表面
+# 需要当前线程/进程已有可用的 OpenGL 上下文（例如通过 EGL 创建的无头上下文），否则 MakeGL 返回 None
+SCROLL_RENDER_GPU = os.getenv("SCROLL_RENDER_GPU", "0") == "1"
+
+# 排版缓存条目数（按配置指纹缓存）
+LAYOUT_CACHE_SIZE = 8
+# 复用的绘制表面数量（按尺寸区分，区段/帧尺寸通常固定）
+SURFACE_POOL_SIZE = 4
+# 超出长图范围的空白（全透明）区段 PNG 缓存条目数（按尺寸区分）
+BLANK_CHUNK_CACHE_SIZE = 4
+
+# 区段按固定高度的图块对齐渲染：任意 y_start / chunk_height 的请求都由同一组图块拼出，
+# 图块像素缓存后，相邻/重叠的区段请求只需拼接和编码
+TILE_HEIGHT = 1024
+# 图块缓存条目数（4K 宽度下每个图块约 16MB）
+TILE_CACHE_SIZE = int(os.getenv("SCROLL_TILE_CACHE_SIZE", "6"))
+
+PictureKey = Tuple[int, int, bool, bool]
+TileKey = Tuple[PictureKey, int]
+
+# 整条字幕的 SkPicture 与区段图块在进程内各引擎（各渲染/预取线程）之间共享，按配置指纹等区分：
+# Picture 与光栅图块都是不可变对象，可在多个线程中同时回放/读取，同一配置只需录制、光栅化一次
+_picture_cache: "OrderedDict[PictureKey, skia.Picture]" = OrderedDict()
+_tile_cache: "OrderedDict[TileKey, skia.Image]" = OrderedDict()
+_render_cache_lock = threading.Lock()
+
+
+class SubtitleLayout(NamedTuple):
+    """单个字幕的排版预计算结果"""
+    lines: List[str]
+    line_advance: float  # 行距（浮点，绘制时使用，保持亚像素精度）
+    block_height: int  # 字幕块总高度（每行取整后累加，用于计算总高度）
+
+
+def _make_gpu_context() -> Optional[skia.GrDirectContext]:
+    """创建 OpenGL 后端的 GrDirectContext，不可用时返回 None"""
+    try:
+        context = skia.GrDirectContext.MakeGL()
+    except Exception as e:
+        print(f"[GPU] 创建 GrDirectContext 失败，使用 CPU 渲染: {e}")
+        return None
+    if context is None:
+        print("[GPU] 没有可用的 OpenGL 上下文，使用 CPU 渲染")
+    return context
+
+
+def _sequence_worker_count(frame_count: int) -> int:
+    if frame_count < SEQUENCE_PARALLEL_MIN_FRAMES:
+        return 1
+    return max(1, min(SEQUENCE_WORKERS, frame_count))
+
+
+# 各次并发导出共用的工作进程额度：每次导出都会新建进程池，额度保证进程总数不超过 SEQUENCE_WORKERS
+_sequence_workers_lock = threading.Lock()
+_sequence_workers_free = SEQUENCE_WORKERS
+
+
+@contextmanager
+def _reserve_sequence_workers(frame_count: int) -> Iterator[int]:
+    """
+    从共用额度中为一次序列导出预留工作进程，退出时归还
+    额度不足 2 个进程时返回 1（在当前进程内流水渲染），不再额外启动进程
+    """
+    global _sequence_workers_free
+    with _sequence_workers_lock:
+        reserved = min(_sequence_worker_count(frame_count), _sequence_workers_free)
+        if reserved < 2:
+            reserved = 0
+        _sequence_workers_free -= reserved
+    try:
+        yield max(1, reserved)
+    finally:
+        with _sequence_workers_lock:
+            _sequence_workers_free += reserved
+
 
 class LongScrollRenderEngineSkia:
     """长画布滚动渲染引擎（分块输出 PNG）"""
 
     def __init__(self):
-        self.font_cache = {}
+        self.font_cache: "OrderedDict[Tuple[str, int, bool, bool, bool], skia.Font]" = OrderedDict()
         self._init_default_fonts()
         # 字体渲染配置（用于"确保没有滚动"模式）
         self.enable_baseline_snap = False
         self.enable_hinting = False
+        # 字形 run 缓存：(字体参数, 字体模式, 文本段) -> GlyphRun（字形、字宽、段内位置、整段宽度）
+        self._run_cache = {}
+        # 帧像素回读缓冲：(width, height) -> (height, width, 4) uint8，序列帧之间复用
+        self._frame_buffers = {}
+        # 排版缓存：配置指纹 -> 每个字幕的 SubtitleLayout
+        self._layout_cache: "OrderedDict[int, List[SubtitleLayout]]" = OrderedDict()
+        # 绘制表面池：(width, height) -> Surface，区段/帧之间复用像素缓冲
+        self._surface_pool: "OrderedDict[Tuple[int, int], skia.Surface]" = OrderedDict()
+        # 文字画笔：引擎实例内共用一个，各字幕绘制前只替换颜色（drawTextBlob 录制时拷贝画笔状态）
+        self._text_paint = self._make_text_paint()
+        # 空白区段 PNG：(width, chunk_height) -> PNG bytes，全透明与背景色无关，只需按尺寸编码一次
+        self._blank_chunk_cache: "OrderedDict[Tuple[int, int], bytes]" = OrderedDict()
+        # 整条字幕录制成的 SkPicture（(配置指纹, 总高度, baseline snap, hinting) -> Picture）和区段图块
+        # （(picture 缓存键, 图块行号) -> 图块像素）使用模块级共享缓存 _picture_cache / _tile_cache
+        # GPU 上下文（仅在 SCROLL_RENDER_GPU=1 且 OpenGL 可用时存在），为 None 时使用 CPU 光栅表面
+        self._gr_context: Optional[skia.GrDirectContext] = _make_gpu_context() if SCROLL_RENDER_GPU else None
 
     # ---- 字体管理 ----
     def _init_default_fonts(self):
-        """初始化默认字体路径（与 RenderEngineSkia 保持一致逻辑）"""
-        system = platform.system()
-        if system == "Darwin":  # macOS
-            pingfang_paths = [
-                "/System/Library/Fonts/PingFang.ttc",
-                "/System/Library/Fonts/Supplemental/PingFang.ttc",
-                "/Library/Fonts/PingFang.ttc",
-            ]
-            self.default_cn_font = None
-            for path in pingfang_paths:
-                try:
-                    skia.Typeface.MakeFromFile(path)
-                    self.default_cn_font = path
-                    break
-                except:  # noqa: E722
-                    continue
-
-            if not self.default_cn_font:
-                try:
-                    self.default_cn_font = "/System/Library/Fonts/STHeiti Light.ttc"
-                    skia.Typeface.MakeFromFile(self.default_cn_font)
-                except:  # noqa: E722
-                    self.default_cn_font = None
-
-            helvetica_paths = [
-                "/System/Library/Fonts/Helvetica.ttc",
-                "/System/Library/Fonts/HelveticaNeue.ttc",
-            ]
-            self.default_en_font = None
-            for path in helvetica_paths:
-                try:
-                    skia.Typeface.MakeFromFile(path)
-                    self.default_en_font = path
-                    break
-                except:  # noqa: E722
-                    continue
-        elif system == "Windows":
-            self.default_cn_font = "C:/Windows/Fonts/msyh.ttc"
-            self.default_en_font = "C:/Windows/Fonts/arial.ttf"
-        else:  # Linux
-            self.default_cn_font = "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc"
-            self.default_en_font = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+        """初始化默认字体路径（与 RenderEngineSkia 共用同一份解析结果）"""
+        self.default_cn_font, self.default_en_font = resolve_default_fonts()
 
     def get_font(self, font_family: str, font_size: int, is_chinese: bool = False) -> skia.Font:
         """获取 Skia 字体（带缓存），根据配置启用/禁用 Baseline Snapping 和 Hinting"""
         # 将字体配置也加入缓存键，因为不同配置需要不同的字体对象
-        cache_key = f"{font_family}_{font_size}_{is_chinese}_{self.enable_baseline_snap}_{self.enable_hinting}"
+        cache_key = (font_family, font_size, is_chinese, self.enable_baseline_snap, self.enable_hinting)
         if cache_key not in self.font_cache:
-            try:
-                typeface = skia.Typeface.MakeFromFile(font_family)
-            except:  # noqa: E722
-                if is_chinese:
-                    if self.default_cn_font:
-                        try:
-                            typeface = skia.Typeface.MakeFromFile(self.default_cn_font)
-                        except:  # noqa: E722
-                            typeface = skia.Typeface.MakeDefault()
-                    else:
-                        typeface = skia.Typeface.MakeDefault()
-                else:
-                    if self.default_en_font:
-                        try:
-                            typeface = skia.Typeface.MakeFromFile(self.default_en_font)
-                        except:  # noqa: E722
-                            typeface = skia.Typeface.MakeDefault()
-                    else:
-                        typeface = skia.Typeface.MakeDefault()
+            typeface = load_typeface(font_family, is_chinese)
 
             font = skia.Font(typeface, font_size)
 
@@ -147,30 +230,223 @@ class LongScrollRenderEngineSkia:
                 pass
             
             self.font_cache[cache_key] = font
+            while len(self.font_cache) > FONT_CACHE_SIZE:
+                self.font_cache.popitem(last=False)
+            return font
+        self.font_cache.move_to_end(cache_key)
         return self.font_cache[cache_key]
 
+    def _glyph_run(self, font_family: str, font_size: int, is_chinese: bool, text: str) -> GlyphRun:
+        """
+        取文本段的字形、字宽、段内字形位置和整段宽度（带缓存），一次查找得到绘制和推进 x 所需的全部度量
+        缓存键使用字体参数和当前字体模式而不是字体对象（id 可能在字体对象回收后被复用）
+        演职员表中重复的职务、词语只需整形一次；返回的数组只读，调用方不得原地修改
+        """
+        key = (font_family, font_size, is_chinese, self.enable_baseline_snap, self.enable_hinting, text)
+        run = self._run_cache.get(key)
+        if run is None:
+            if len(self._run_cache) >= MEASURE_CACHE_SIZE:
+                self._run_cache.clear()
+            run = self._run_cache[key] = shape_run(self.get_font(font_family, font_size, is_chinese=is_chinese), text)
+        return run
+
     # ---- 公共工具 ----
-    def is_chinese_char(self, char: str) -> bool:
-        return '\u4e00' <= char <= '\u9fff'
+    def _layout(self, config: RenderConfig) -> List[SubtitleLayout]:
+        """
+        预计算每个字幕的分行与行高（带缓存），总高度计算和绘制共用，避免每个区段/帧重复 split 和计算
+        按配置指纹缓存，跨请求重建的相同配置也能命中
+        """
+        fingerprint = config.fingerprint()
+        cached = self._layout_cache.get(fingerprint)
+        if cached is not None:
+            self._layout_cache.move_to_end(fingerprint)
+            return cached
+
+        layout = []
+        for subtitle in config.subtitles:
+            lines = subtitle.text.split("\n")
+            line_advance = float(subtitle.font_size * subtitle.line_height)
+            layout.append(SubtitleLayout(lines, line_advance, int(line_advance) * len(lines)))
+
+        self._layout_cache[fingerprint] = layout
+        self._layout_cache.move_to_end(fingerprint)
+        while len(self._layout_cache) > LAYOUT_CACHE_SIZE:
+            self._layout_cache.popitem(last=False)
+        return layout
 
     def calculate_total_height(self, config: RenderConfig, top_padding: int = 0, bottom_padding: int = 0) -> int:
         """
         计算整条字幕在纵向上的总高度，用于创建长画布或决定分块数量
         """
-        max_y = 0
-        for subtitle in config.subtitles:
-            lines = subtitle.text.split("\n")
-            line_count = len(lines)
-            block_height = 0
-            for line in lines:
-                if not line.strip():
-                    block_height += int(subtitle.font_size * subtitle.line_height)
-                    continue
-                block_height += int(subtitle.font_size * subtitle.line_height)
-            max_y = max(max_y, subtitle.y + block_height)
+        subtitles = config.subtitles
+        if not subtitles:
+            return max(config.height, top_padding + bottom_padding)
+
+        # 按字幕整体向量化：行数只需数换行符，不必 split 出每一行；
+        # 块高与 _layout 一致，按 int(行高) * 行数 计算（空行同样占一行）
+        count = len(subtitles)
+        ys = np.fromiter((s.y for s in subtitles), dtype=np.int64, count=count)
+        line_counts = np.fromiter((s.text.count("\n") + 1 for s in subtitles), dtype=np.int64, count=count)
+        line_advances = np.fromiter((s.font_size * s.line_height for s in subtitles), dtype=np.float64, count=count)
+        block_heights = np.trunc(line_advances).astype(np.int64) * line_counts
+        max_y = max(0, int((ys + block_heights).max()))
 
         return max(config.height, max_y + top_padding + bottom_padding)
 
+    # ---- SkPicture 缓存 ----
+    def _picture_key(self, config: RenderConfig, total_height: int) -> PictureKey:
+        return config.fingerprint(), total_height, self.enable_baseline_snap, self.enable_hinting
+
+    def _get_or_build_picture(self, config: RenderConfig, total_height: int) -> skia.Picture:
+        """
+        获取整条字幕的 SkPicture（带 LRU 缓存），未命中时按当前字体配置录制一次
+        字体模式（baseline snap / hinting）不同，字形也不同，因此一并作为缓存键
+        """
+        key = self._picture_key(config, total_height)
+        with _render_cache_lock:
+            picture = _picture_cache.get(key)
+            if picture is not None:
+                _picture_cache.move_to_end(key)
+                return picture
+
+        recorder = skia.PictureRecorder()
+        bounds = skia.Rect(0, 0, config.width, total_height)
+        if hasattr(skia, "RTreeFactory"):
+            # 附带 R-Tree 包围盒索引：回放时只访问与当前区段/帧裁剪区相交的绘制操作，
+            # 窗口外的字幕（滚动时通常是绝大多数）直接被剔除
+            canvas = recorder.beginRecording(bounds, skia.RTreeFactory()())
+        else:
+            canvas = recorder.beginRecording(bounds)
+        for subtitle, layout in zip(config.subtitles, self._layout(config)):
+            self._render_subtitle(canvas, subtitle, config.width, total_height, layout)
+        picture = recorder.finishRecordingAsPicture()
+
+        with _render_cache_lock:
+            # 其他线程同时录制了同一配置时沿用先写入的那份
+            picture = _picture_cache.setdefault(key, picture)
+            _picture_cache.move_to_end(key)
+            while len(_picture_cache) > PICTURE_CACHE_SIZE:
+                _picture_cache.popitem(last=False)
+        return picture
+
+    # ---- 区段图块 ----
+    def _get_tile(
+        self,
+        config: RenderConfig,
+        total_height: int,
+        tile_row: int,
+        picture_key: Optional[PictureKey] = None,
+    ) -> skia.Image:
+        """
+        获取长画布上第 tile_row 个图块（[tile_row * TILE_HEIGHT, (tile_row + 1) * TILE_HEIGHT)，带背景）
+        图块用独立表面绘制：快照被缓存持有，复用池中表面会在下次绘制时触发写时复制
+        picture_key 可由调用方预先计算，连续取多个图块时避免重复计算配置指纹
+        """
+        key = (picture_key or self._picture_key(config, total_height), tile_row)
+        with _render_cache_lock:
+            tile = _tile_cache.get(key)
+            if tile is not None:
+                _tile_cache.move_to_end(key)
+                return tile
+
+        tile = self._draw_tile(config, total_height, tile_row)
+        with _render_cache_lock:
+            tile = _tile_cache.setdefault(key, tile)
+            _tile_cache.move_to_end(key)
+            while len(_tile_cache) > TILE_CACHE_SIZE:
+                _tile_cache.popitem(last=False)
+        return tile
+
+    def _draw_tile(self, config: RenderConfig, total_height: int, tile_row: int) -> skia.Image:
+        """绘制第 tile_row 个图块（带背景，不经过缓存），返回内存中的图像"""
+        surface = self._make_surface(config.width, TILE_HEIGHT)
+        canvas = surface.getCanvas()
+        canvas.clear(skia.Color(
+            config.background_color[0],
+            config.background_color[1],
+            config.background_color[2],
+        ))
+        canvas.translate(0, -tile_row * TILE_HEIGHT)
+        canvas.drawPicture(self._get_or_build_picture(config, total_height))
+        tile = surface.makeImageSnapshot()
+        if tile.isTextureBacked():
+            # GPU 绘制的图块读回内存，序列帧直接从图块按行拷贝像素
+            tile = tile.makeRasterImage()
+        return tile
+
+    # ---- 绘制表面 ----
+    def _make_surface(self, width: int, height: int) -> skia.Surface:
+        """
+        创建绘制表面：有 GPU 上下文时创建 GPU 渲染目标（picture 回放、字形光栅化在 GPU 上完成），
+        尺寸超出纹理上限等原因创建失败时回退到 CPU 光栅表面
+        """
+        if self._gr_context is not None:
+            surface = skia.Surface.MakeRenderTarget(
+                self._gr_context, skia.Budgeted.kNo, skia.ImageInfo.MakeN32Premul(width, height)
+            )
+            if surface is not None:
+                return surface
+        return skia.Surface(width, height)
+
+    def _acquire_surface(self, width: int, height: int) -> skia.Surface:
+        """
+        获取指定尺寸的可复用表面（不清空内容，由调用方 clear），并重置画布的变换/裁剪状态
+        仅用于固定尺寸的区段/帧；整条长图尺寸各不相同，不进池
+        """
+        key = (width, height)
+        surface = self._surface_pool.get(key)
+        if surface is None:
+            surface = self._surface_pool[key] = self._make_surface(width, height)
+            while len(self._surface_pool) > SURFACE_POOL_SIZE:
+                self._surface_pool.popitem(last=False)
+        else:
+            self._surface_pool.move_to_end(key)
+            canvas = surface.getCanvas()
+            canvas.restoreToCount(1)
+            canvas.resetMatrix()
+        return surface
+
+    # ---- PNG 编码 ----
+    def _encode_png(self, image: skia.Image, opaque: bool = True) -> bytes:
+        """
+        将 Skia 图像编码为 PNG：优先使用 pymtpng 多线程编码（长图编码耗时随核心数下降），否则使用 Skia 编码器
+        opaque=True 时丢弃 alpha 通道输出 RGB（背景已铺满，不透明）
+        """
+        if image.isTextureBacked():
+            # GPU 表面的快照在显存中，先读回 CPU 再编码
+            image = image.makeRasterImage()
+
+        if pymtpng is None:
+            return bytes(image.encodeToData())
+
+        # Skia 表面默认是 BGRA（平台相关），按 RGBA 读出
+        pixels = image.toarray(colorType=skia.kRGBA_8888_ColorType)
+        if opaque:
+            pixels = np.ascontiguousarray(pixels[:, :, :3])
+        output = io.BytesIO()
+        pymtpng.encode_png(
+            pixels,
+            output,
+            compression_level=pymtpng.CompressionLevel.Fast,
+            filter=pymtpng.Filter.Adaptive,
+        )
+        return output.getvalue()
+
+    def _blank_chunk_png(self, width: int, height: int) -> bytes:
+        """获取指定尺寸的全透明区段 PNG（带缓存）"""
+        key = (width, height)
+        png_data = self._blank_chunk_cache.get(key)
+        if png_data is not None:
+            self._blank_chunk_cache.move_to_end(key)
+            return png_data
+
+        surface = self._acquire_surface(width, height)
+        surface.getCanvas().clear(skia.ColorTRANSPARENT)
+        png_data = self._blank_chunk_cache[key] = self._encode_png(surface.makeImageSnapshot(), opaque=False)
+        while len(self._blank_chunk_cache) > BLANK_CHUNK_CACHE_SIZE:
+            self._blank_chunk_cache.popitem(last=False)
+        return png_data
+
     # ---- 渲染入口 ----
     def render_chunk_png(
         self,
@@ -202,8 +478,6 @@ class LongScrollRenderEngineSkia:
         if config.ensure_no_scroll:
             self.enable_baseline_snap = True
             self.enable_hinting = True
-            # 清空字体缓存，因为配置改变了
-            self.font_cache.clear()
         else:
             self.enable_baseline_snap = False
             self.enable_hinting = False
@@ -213,72 +487,35 @@ class LongScrollRenderEngineSkia:
 
             # 如果请求超出范围，返回空白块
             if y_start >= total_height:
-                surface = skia.Surface(config.width, chunk_height)
-                png_data = surface.makeImageSnapshot().encodeToData(skia.EncodedImageFormat.kPNG, 100)
-                return bytes(png_data), (time.time() - start_time) * 1000, total_height
+                png_data = self._blank_chunk_png(config.width, chunk_height)
+                return png_data, (time.time() - start_time) * 1000, total_height
 
-            surface = skia.Surface(config.width, chunk_height)
+            surface = self._acquire_surface(config.width, chunk_height)
             canvas = surface.getCanvas()
 
-            # 背景
-            canvas.clear(skia.Color(
-                config.background_color[0],
-                config.background_color[1],
-                config.background_color[2],
-            ))
-
-            # 将画布上移 y_start，使得只绘制该区段可见部分
-            canvas.save()
-            canvas.translate(0, -y_start)
-
-            for subtitle in config.subtitles:
-                self._render_subtitle(canvas, subtitle, config.width, total_height)
-
-            canvas.restore()
+            # 由覆盖 [y_start, y_start + chunk_height) 的图块拼出区段（图块自带背景，整数偏移逐像素拷贝）
+            first_row = y_start // TILE_HEIGHT
+            last_row = (y_start + chunk_height - 1) // TILE_HEIGHT
+            for tile_row in range(first_row, last_row + 1):
+                tile = self._get_tile(config, total_height, tile_row)
+                canvas.drawImage(tile, 0, tile_row * TILE_HEIGHT - y_start)
 
             # 输出 PNG
-            image = surface.makeImageSnapshot()
-            png_data = image.encodeToData(skia.EncodedImageFormat.kPNG, 100)
+            png_data = self._encode_png(surface.makeImageSnapshot())
             render_time = (time.time() - start_time) * 1000
-            return bytes(png_data), render_time, total_height
+            return png_data, render_time, total_height
         finally:
             # 恢复原始字体配置
             self.enable_baseline_snap = original_baseline_snap
             self.enable_hinting = original_hinting
-            self.font_cache.clear()
 
-    def render_tiff_sequence_timebased(
-        self,
-        req: RenderSequenceRequest,
-        output_dir: Optional[str] = None,
-    ) -> Tuple[List[str], float, int, int]:
+    def _plan_timebased_frames(self, req: RenderSequenceRequest) -> Tuple[RenderConfig, int, int, List[int]]:
         """
-        基于时间轴/FPS 的序列帧渲染：
-        - 给定 fps 和 duration_sec 或 scroll_speed(px/s)
-        - 每帧 y 偏移 = frameIndex * pixelsPerFrame
-        - 帧尺寸固定：width=config.width, height=config.height
-        - 支持"确保没有滚动"模式：开启 Baseline Snapping 和 Hinting，并取整 px/frame
-        返回：帧路径列表、耗时 ms、总高度、总帧数
+        基于时间轴/FPS 规划逐帧的 y_start（TIFF 序列与视频流共用）
+        需在设置好 baseline snap / hinting 之后调用
+        返回：实际渲染用的配置（时长优先模式下可能调整了行间距）、总高度、总帧数、每帧 y_start 列表
         """
-        start_time = time.time()
         config = req.config
-        target_dir = output_dir or BASE_TEMP_DIR
-        os.makedirs(target_dir, exist_ok=True)
-
-        # 保存原始配置，以便后续恢复
-        original_baseline_snap = self.enable_baseline_snap
-        original_hinting = self.enable_hinting
-        
-        # 如果启用"确保没有滚动"，开启 Baseline Snapping 和 Hinting
-        if req.ensure_no_scroll:
-            self.enable_baseline_snap = True
-            self.enable_hinting = True
-            # 清空字体缓存，因为配置改变了
-            self.font_cache.clear()
-        else:
-            self.enable_baseline_snap = False
-            self.enable_hinting = False
-
         total_height = self.calculate_total_height(config)
         scroll_pixels = max(0, total_height - config.height)
 
@@ -362,13 +599,14 @@ class LongScrollRenderEngineSkia:
                         # 确保比例合理（不能太小或太大）
                         height_ratio = max(0.5, min(2.0, height_ratio))
                         
-                        # 创建调整后的配置副本
-                        from copy import deepcopy
-                        adjusted_config = deepcopy(config)
-                        
-                        # 按比例调整所有字幕的行间距
-                        for subtitle in adjusted_config.subtitles:
-                            subtitle.line_height = subtitle.line_height * height_ratio
+                        # 按比例调整所有字幕的行间距：浅拷贝配置与每个字幕，只替换 line_height，
+                        # 文本等其余字段与原配置共享，不再整体 deepcopy
+                        adjusted_config = config.model_copy(update={
+                            "subtitles": [
+                                subtitle.model_copy(update={"line_height": subtitle.line_height * height_ratio})
+                                for subtitle in config.subtitles
+                            ]
+                        })
                         
                         # 重新计算总高度
                         total_height = self.calculate_total_height(adjusted_config)
@@ -384,98 +622,356 @@ class LongScrollRenderEngineSkia:
                 else:
                     print(f"[优化-时长优先] 差异太小，无需调整行间距")
 
-        try:
-            frame_paths: List[str] = []
-            prev_img: Optional[np.ndarray] = None
-            prev_y_start: Optional[int] = None
+        # 先确定每帧的 y_start（帧之间相互独立，便于并行渲染）
+        y_starts: List[int] = []
+        prev_y_start: Optional[int] = None
+        # 逐帧调试信息先收集，规划结束后一次性输出，不在循环内逐行写 stdout
+        debug_lines: List[str] = []
 
-            print(f"[渲染开始] 总帧数={total_frames}, px/frame={pixels_per_frame:.4f}, scroll_pixels={scroll_pixels:.2f}")
+        print(f"[渲染开始] 总帧数={total_frames}, px/frame={pixels_per_frame:.4f}, scroll_pixels={scroll_pixels:.2f}")
 
-            for idx in range(total_frames):
-                # 计算当前帧的 y_start，确保是整数像素（避免亚像素偏移导致重复帧）
-                y_start_float = idx * pixels_per_frame
-                y_start = int(round(y_start_float))
-                y_start = min(int(scroll_pixels), y_start)  # 确保不超过最大滚动距离
-                
-                # 确保每帧的 y_start 至少比前一帧大 1 像素（如果可能）
-                if idx > 0 and prev_y_start is not None:
-                    if y_start <= prev_y_start:
-                        y_start = prev_y_start + 1
-                        y_start = min(int(scroll_pixels), y_start)
-                        if y_start > scroll_pixels:
-                            # 如果已经到达底部，停止渲染
-                            print(f"[渲染] 警告：Frame {idx} 已到达底部，停止渲染")
-                            break
-                
-                # 调试信息（前5帧和最后1帧）
-                if idx < 5 or idx == total_frames - 1 or (idx % 100 == 0):
-                    print(f"[渲染] Frame {idx}: y_start={y_start} (px/frame={pixels_per_frame:.4f}, 计算值={y_start_float:.4f})")
+        for idx in range(total_frames):
+            # 计算当前帧的 y_start，确保是整数像素（避免亚像素偏移导致重复帧）
+            y_start_float = idx * pixels_per_frame
+            y_start = int(round(y_start_float))
+            y_start = min(int(scroll_pixels), y_start)  # 确保不超过最大滚动距离
+            
+            # 确保每帧的 y_start 至少比前一帧大 1 像素（如果可能）
+            if idx > 0 and prev_y_start is not None:
+                if y_start <= prev_y_start:
+                    y_start = prev_y_start + 1
+                    y_start = min(int(scroll_pixels), y_start)
+                    if y_start > scroll_pixels:
+                        # 如果已经到达底部，停止渲染
+                        print(f"[渲染] 警告：Frame {idx} 已到达底部，停止渲染")
+                        break
+            
+            # 调试信息（前5帧和最后1帧）
+            if SEQUENCE_DEBUG and (idx < 5 or idx == total_frames - 1 or (idx % 100 == 0)):
+                debug_lines.append(
+                    f"[渲染] Frame {idx}: y_start={y_start} (px/frame={pixels_per_frame:.4f}, 计算值={y_start_float:.4f})"
+                )
 
-                surface = skia.Surface(config.width, config.height)
-                canvas = surface.getCanvas()
+            y_starts.append(y_start)
+            prev_y_start = y_start
 
-                canvas.clear(skia.Color(
-                    config.background_color[0],
-                    config.background_color[1],
-                    config.background_color[2],
-                ))
+        if debug_lines:
+            print("\n".join(debug_lines))
+        return adjusted_config, total_height, total_frames, y_starts
 
-                canvas.save()
-                canvas.translate(0, -float(y_start))  # 使用浮点数以确保精度
+    def render_tiff_sequence_timebased(
+        self,
+        req: RenderSequenceRequest,
+        output_dir: Optional[str] = None,
+    ) -> Tuple[List[str], float, int, int]:
+        """
+        基于时间轴/FPS 的序列帧渲染：
+        - 给定 fps 和 duration_sec 或 scroll_speed(px/s)
+        - 每帧 y 偏移 = frameIndex * pixelsPerFrame
+        - 帧尺寸固定：width=config.width, height=config.height
+        - 支持"确保没有滚动"模式：开启 Baseline Snapping 和 Hinting，并取整 px/frame
+        返回：帧路径列表、耗时 ms、总高度、总帧数
+        """
+        start_time = time.time()
+        target_dir = output_dir or BASE_TEMP_DIR
+        os.makedirs(target_dir, exist_ok=True)
 
-                # # 验证变换矩阵
-                # matrix = canvas.getTotalMatrix()
-                # print(f"Frame {idx}: y_start={y_start}, matrix ty={matrix.getTranslateY()}")
+        # 保存原始配置，以便后续恢复
+        original_baseline_snap = self.enable_baseline_snap
+        original_hinting = self.enable_hinting
+        
+        # 如果启用"确保没有滚动"，开启 Baseline Snapping 和 Hinting
+        if req.ensure_no_scroll:
+            self.enable_baseline_snap = True
+            self.enable_hinting = True
+        else:
+            self.enable_baseline_snap = False
+            self.enable_hinting = False
 
-                for subtitle in adjusted_config.subtitles:
-                    self._render_subtitle(canvas, subtitle, config.width, total_height)
+        try:
+            adjusted_config, total_height, total_frames, y_starts = self._plan_timebased_frames(req)
+            frame_plan = [
+                (y_start, os.path.join(target_dir, f"frame_{idx:05d}.tiff"))
+                for idx, y_start in enumerate(y_starts)
+            ]
 
-                canvas.restore()
+            with _reserve_sequence_workers(len(frame_plan)) as workers:
+                if workers > 1:
+                    frame_paths = self._render_frames_parallel(adjusted_config, total_height, frame_plan, workers)
+                else:
+                    frames = self._iter_frames_pipelined(adjusted_config, total_height, frame_plan)
+                    if SEQUENCE_DEBUG:
+                        frame_paths = self._collect_frames_debug(frames)
+                    else:
+                        frame_paths = [frame_path for _, frame_path, _ in frames]
 
-                image = surface.makeImageSnapshot()
-                pixels = image.tobytes()
-                img_array = np.frombuffer(pixels, dtype=np.uint8)
-                img_array = img_array.reshape((config.height, config.width, 4))  # RGBA
-                img_array = img_array[:, :, :3]  # RGB
+            render_time = (time.time() - start_time) * 1000
+            
+            return frame_paths, render_time, total_height, total_frames
+        finally:
+            # 恢复原始字体配置（无论成功还是异常）
+            self.enable_baseline_snap = original_baseline_snap
+            self.enable_hinting = original_hinting
 
-                # 调试：比较相邻两帧的像素差异，确认是否存在完全相同的帧
+    @staticmethod
+    def _collect_frames_debug(frames: Iterator[Tuple[int, str, np.ndarray]]) -> List[str]:
+        """
+        调试：逐帧比较相邻两帧的像素差异，确认是否存在完全相同的帧，返回帧路径列表
+        上一帧拷贝到固定的缓冲中（流水线的帧缓冲会被复用），差值在 uint8 上按 max - min 计算，不做 int16 提升
+        差异信息先收集，全部帧写出后（或出错时）一次性输出
+        """
+        frame_paths: List[str] = []
+        prev_img: Optional[np.ndarray] = None
+        prev_y_start: Optional[int] = None
+        debug_lines: List[str] = []
+        try:
+            for idx, (y_start, frame_path, img_array) in enumerate(frames):
                 if prev_img is not None and prev_y_start is not None:
-                    # 使用 int16 防止减法溢出
-                    diff = np.abs(img_array.astype(np.int16) - prev_img.astype(np.int16))
-                    max_diff = int(diff.max())
+                    max_diff = int((np.maximum(img_array, prev_img) - np.minimum(img_array, prev_img)).max())
                     y_diff = y_start - prev_y_start
-                    
-                    # 只在有差异或前几帧时打印
+
+                    # 只记录完全相同的帧或前几帧
                     if max_diff == 0 or idx < 5:
-                        print(
+                        debug_lines.append(
                             f"[帧差异] Frame {idx-1}->{idx}: "
                             f"y_start_prev={prev_y_start}, y_start_curr={y_start}, y_diff={y_diff}, "
                             f"max_rgb_diff={max_diff}"
                         )
                         if max_diff == 0 and y_diff > 0:
-                            print(f"[警告] Frame {idx-1} 和 {idx} 完全相同，但 y_start 不同！")
-                prev_img = img_array.copy()
+                            debug_lines.append(f"[警告] Frame {idx-1} 和 {idx} 完全相同，但 y_start 不同！")
+
+                if prev_img is None:
+                    prev_img = np.empty_like(img_array)
+                np.copyto(prev_img, img_array)
                 prev_y_start = y_start
+                frame_paths.append(frame_path)
+        finally:
+            if debug_lines:
+                print("\n".join(debug_lines))
+        return frame_paths
+
+    def render_video_stream(
+        self,
+        req: RenderSequenceRequest,
+        output_path: str,
+    ) -> Tuple[float, int, int]:
+        """
+        与 render_tiff_sequence_timebased 相同的逐帧渲染，但不写 TIFF：
+        每帧的 RGBA 像素直接写入 ffmpeg 的 stdin（rawvideo），由 ffmpeg 编码为视频文件
+        省去逐帧的文件创建、TIFF 编码和中间文件的磁盘读写
+        返回：耗时 ms、总高度、总帧数
+        """
+        start_time = time.time()
+        config = req.config
 
-                frame_name = f"frame_{idx:05d}.tiff"
-                frame_path = os.path.join(target_dir, frame_name)
+        original_baseline_snap = self.enable_baseline_snap
+        original_hinting = self.enable_hinting
 
-                spec = oiio.ImageSpec(config.width, config.height, 3, oiio.UINT8)
-                buf = oiio.ImageBuf(spec)
-                buf.set_pixels(oiio.ROI(0, config.width, 0, config.height, 0, 1, 0, 3), img_array)
-                buf.write(frame_path)
+        if req.ensure_no_scroll:
+            self.enable_baseline_snap = True
+            self.enable_hinting = True
+        else:
+            self.enable_baseline_snap = False
+            self.enable_hinting = False
 
-                frame_paths.append(frame_path)
+        try:
+            adjusted_config, total_height, total_frames, y_starts = self._plan_timebased_frames(req)
+
+            cmd = [
+                FFMPEG_BIN, "-y", "-loglevel", "error",
+                "-f", "rawvideo", "-pix_fmt", "rgba",
+                "-s", f"{config.width}x{config.height}",
+                "-r", f"{max(1e-3, req.fps):g}",
+                "-i", "-",
+                "-an", "-c:v", VIDEO_CODEC, "-pix_fmt", "yuv420p",
+            ]
+            if config.width % 2 or config.height % 2:
+                # yuv420p 要求宽高为偶数，奇数尺寸时补一像素边
+                cmd += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+            cmd.append(output_path)
+
+            # stderr 写入临时文件而不是管道，避免 ffmpeg 输出过多时管道写满、与 stdin 写入互相阻塞
+            with tempfile.TemporaryFile() as stderr_file:
+                try:
+                    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=stderr_file)
+                except FileNotFoundError:
+                    raise RuntimeError(f"未找到 ffmpeg 可执行文件: {FFMPEG_BIN}")
+
+                try:
+                    for y_start in y_starts:
+                        # RGBA 缓冲本身连续，直接写入，不再拷贝成 RGB
+                        proc.stdin.write(self._read_frame_rgba(adjusted_config, total_height, y_start).data)
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass  # ffmpeg 提前退出，下面根据返回码报告错误
+                except BaseException:
+                    proc.kill()
+                    proc.wait()
+                    raise
+                finally:
+                    if not proc.stdin.closed:
+                        try:
+                            proc.stdin.close()
+                        except BrokenPipeError:
+                            pass
+
+                if proc.wait() != 0:
+                    stderr_file.seek(0)
+                    detail = stderr_file.read().decode("utf-8", "replace").strip()
+                    raise RuntimeError(f"ffmpeg 编码失败（返回码 {proc.returncode}）: {detail}")
 
             render_time = (time.time() - start_time) * 1000
-            
-            return frame_paths, render_time, total_height, total_frames
+            return render_time, total_height, total_frames
         finally:
-            # 恢复原始字体配置（无论成功还是异常）
             self.enable_baseline_snap = original_baseline_snap
             self.enable_hinting = original_hinting
-            # 清空字体缓存，恢复默认配置
-            self.font_cache.clear()
+
+    def _render_frames_parallel(
+        self,
+        config: RenderConfig,
+        total_height: int,
+        frame_plan: List[Tuple[int, str]],
+        workers: int,
+    ) -> List[str]:
+        """
+        多进程并行渲染序列帧：每个工作进程持有独立的引擎实例（配置在 initializer 中只传一次），
+        逐帧任务只传 (y_start, frame_path)
+        使用进程而不是线程：排版循环是纯 Python 代码，线程无法绕开 GIL
+        整条字幕的 picture 在主进程录制一次并序列化传给各工作进程，工作进程不再重复排版、测量和整形
+        """
+        picture_data = bytes(self._get_or_build_picture(config, total_height).serialize())
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=_SEQUENCE_MP_CONTEXT,
+            initializer=_init_frame_worker,
+            initargs=(
+                config.model_dump_json(),
+                total_height,
+                self.enable_baseline_snap,
+                self.enable_hinting,
+                picture_data,
+            ),
+        ) as pool:
+            return list(pool.map(_render_one_frame, frame_plan, chunksize=4))
+
+    def _frame_buffer(self, width: int, height: int) -> np.ndarray:
+        """复用的 (height, width, 4) 帧像素缓冲（下一帧会覆盖，需要保留时自行 copy）"""
+        rgba = self._frame_buffers.get((width, height))
+        if rgba is None:
+            rgba = self._frame_buffers[(width, height)] = np.empty((height, width, 4), dtype=np.uint8)
+        return rgba
+
+    def _read_frame_rgba(
+        self,
+        config: RenderConfig,
+        total_height: int,
+        y_start: int,
+        rgba: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        取长画布上 [y_start, y_start + config.height) 的窗口，按 RGBA 顺序写入 (height, width, 4) 缓冲
+        整条字幕只光栅化成图块一次，每帧从覆盖窗口的图块中按行直接拷贝像素，不再逐帧回放 picture
+        未指定 rgba 时使用复用的缓冲
+        显式指定 kRGBA_8888：Skia 默认是平台相关的 N32（小端机器上为 BGRA），直接 tobytes 会交换 R/B
+        """
+        width, height = config.width, config.height
+        if rgba is None:
+            rgba = self._frame_buffer(width, height)
+        picture_key = self._picture_key(config, total_height)
+
+        y = y_start
+        y_end = y_start + height
+        while y < y_end:
+            tile_row = y // TILE_HEIGHT
+            rows = min(y_end, (tile_row + 1) * TILE_HEIGHT) - y
+            tile = self._get_tile(config, total_height, tile_row, picture_key)
+            info = skia.ImageInfo.Make(width, rows, skia.kRGBA_8888_ColorType, skia.kPremul_AlphaType)
+            dst = rgba[y - y_start:y - y_start + rows]
+            if not tile.readPixels(info, dst, width * 4, 0, y - tile_row * TILE_HEIGHT):
+                raise RuntimeError("回读帧像素失败")
+            y += rows
+        return rgba
+
+    def _read_frame_rgb(self, config: RenderConfig, total_height: int, y_start: int) -> np.ndarray:
+        """取帧窗口像素，返回复用缓冲的 RGB 视图"""
+        return self._read_frame_rgba(config, total_height, y_start)[:, :, :3]
+
+    def _write_frame_tiff(self, img_array: np.ndarray, frame_path: str):
+        """用 OIIO 将一帧 RGB 像素写出为 TIFF"""
+        height, width = img_array.shape[:2]
+        spec = oiio.ImageSpec(width, height, 3, oiio.UINT8)
+        spec.attribute("compression", SEQUENCE_TIFF_COMPRESSION)
+
+        # 直接用 ImageOutput 写出，像素不再先复制进 ImageBuf（OIIO 按数组步长读取 RGBA 缓冲的 RGB 视图）
+        write_oiio_image(frame_path, spec, img_array)
+
+    def _render_frame_tiff(
+        self,
+        config: RenderConfig,
+        total_height: int,
+        y_start: int,
+        frame_path: str,
+    ) -> np.ndarray:
+        """
+        渲染单帧并用 OIIO 写出 TIFF，返回该帧的 RGB 像素
+        """
+        img_array = self._read_frame_rgb(config, total_height, y_start)
+        self._write_frame_tiff(img_array, frame_path)
+        return img_array
+
+    def _iter_frames_pipelined(
+        self,
+        config: RenderConfig,
+        total_height: int,
+        frame_plan: List[Tuple[int, str]],
+    ) -> Iterator[Tuple[int, str, np.ndarray]]:
+        """
+        单进程渲染序列帧：当前线程取帧像素，SEQUENCE_WRITE_THREADS 个写出线程并行负责 TIFF 编码和落盘，
+        与取帧重叠进行（OIIO 写出时释放 GIL）。逐帧产出 (y_start, 帧路径, RGB 像素)，产出时该帧已进入写出队列
+        帧缓冲在线程间循环使用（写出完成后归还），数量 = 队列容量 + 写出线程数 + 正在回读，
+        不再逐帧分配；产出的像素在下一次迭代前有效
+        """
+        write_queue: "queue.Queue[Optional[Tuple[np.ndarray, str]]]" = queue.Queue(maxsize=SEQUENCE_WRITE_QUEUE_SIZE)
+        free_buffers: "queue.Queue[np.ndarray]" = queue.Queue()
+        writer_count = max(1, SEQUENCE_WRITE_THREADS)
+        for _ in range(SEQUENCE_WRITE_QUEUE_SIZE + writer_count + 1):
+            free_buffers.put(np.empty((config.height, config.width, 4), dtype=np.uint8))
+        errors: List[BaseException] = []
+
+        def writer():
+            while True:
+                item = write_queue.get()
+                if item is None:
+                    return
+                rgba, frame_path = item
+                try:
+                    if not errors:  # 已出错时丢弃剩余帧，等待结束信号
+                        self._write_frame_tiff(rgba[:, :, :3], frame_path)
+                except BaseException as e:
+                    errors.append(e)
+                finally:
+                    free_buffers.put(rgba)
+
+        writer_threads = [
+            threading.Thread(target=writer, name=f"tiff-writer-{i}", daemon=True)
+            for i in range(writer_count)
+        ]
+        for thread in writer_threads:
+            thread.start()
+        try:
+            for y_start, frame_path in frame_plan:
+                if errors:
+                    break
+                rgba = self._read_frame_rgba(config, total_height, y_start, free_buffers.get())
+                write_queue.put((rgba, frame_path))
+                yield y_start, frame_path, rgba[:, :, :3]
+        finally:
+            for _ in writer_threads:
+                write_queue.put(None)
+            for thread in writer_threads:
+                thread.join()
+        if errors:
+            raise errors[0]
 
     def render_full_png(self, config: RenderConfig) -> Tuple[bytes, float, int]:
         """
@@ -492,8 +988,6 @@ class LongScrollRenderEngineSkia:
         if config.ensure_no_scroll:
             self.enable_baseline_snap = True
             self.enable_hinting = True
-            # 清空字体缓存，因为配置改变了
-            self.font_cache.clear()
         else:
             self.enable_baseline_snap = False
             self.enable_hinting = False
@@ -501,27 +995,32 @@ class LongScrollRenderEngineSkia:
         try:
             total_height = self.calculate_total_height(config)
 
-            surface = skia.Surface(config.width, total_height)
-            canvas = surface.getCanvas()
+            if self._gr_context is not None:
+                # GPU：整条长图的高度通常超出纹理尺寸上限，按图块在 GPU 上绘制、读回后拼接到 CPU 表面
+                # （整数偏移逐像素拷贝；图块不进缓存，避免挤掉区段预览正在使用的图块）
+                surface = skia.Surface(config.width, total_height)
+                canvas = surface.getCanvas()
+                for tile_row in range(-(-total_height // TILE_HEIGHT)):
+                    canvas.drawImage(self._draw_tile(config, total_height, tile_row), 0, tile_row * TILE_HEIGHT)
+            else:
+                surface = self._make_surface(config.width, total_height)
+                canvas = surface.getCanvas()
 
-            canvas.clear(skia.Color(
-                config.background_color[0],
-                config.background_color[1],
-                config.background_color[2],
-            ))
+                canvas.clear(skia.Color(
+                    config.background_color[0],
+                    config.background_color[1],
+                    config.background_color[2],
+                ))
 
-            for subtitle in config.subtitles:
-                self._render_subtitle(canvas, subtitle, config.width, total_height)
+                canvas.drawPicture(self._get_or_build_picture(config, total_height))
 
-            image = surface.makeImageSnapshot()
-            png_data = image.encodeToData(skia.EncodedImageFormat.kPNG, 100)
+            png_data = self._encode_png(surface.makeImageSnapshot())
             render_time = (time.time() - start_time) * 1000
-            return bytes(png_data), render_time, total_height
+            return png_data, render_time, total_height
         finally:
             # 恢复原始字体配置
             self.enable_baseline_snap = original_baseline_snap
             self.enable_hinting = original_hinting
-            self.font_cache.clear()
 
     def render_tiff_sequence(
         self,
@@ -539,58 +1038,29 @@ class LongScrollRenderEngineSkia:
         target_dir = output_dir or BASE_TEMP_DIR
         os.makedirs(target_dir, exist_ok=True)
 
-        frame_paths: List[str] = []
         frame_count = max(1, math.ceil(total_height / config.height))
-
-        for idx in range(frame_count):
-            y_start = idx * config.height
-
-            # 以固定分辨率创建帧画布
-            surface = skia.Surface(config.width, config.height)
-            canvas = surface.getCanvas()
-
-            # 清背景
-            canvas.clear(skia.Color(
-                config.background_color[0],
-                config.background_color[1],
-                config.background_color[2],
-            ))
-
-            # 将画布上移 y_start，使得当前帧呈现该窗口内容
-            canvas.save()
-            canvas.translate(0, -y_start)
-
-            for subtitle in config.subtitles:
-                self._render_subtitle(canvas, subtitle, config.width, total_height)
-
-            canvas.restore()
-
-            # 获取像素并用 OIIO 输出 TIFF
-            image = surface.makeImageSnapshot()
-            pixels = image.tobytes()
-            img_array = np.frombuffer(pixels, dtype=np.uint8)
-            img_array = img_array.reshape((config.height, config.width, 4))  # RGBA
-            img_array = img_array[:, :, :3]  # RGB
-
-            frame_name = f"frame_{idx:05d}.tiff"
-            frame_path = os.path.join(target_dir, frame_name)
-
-            spec = oiio.ImageSpec(config.width, config.height, 3, oiio.UINT8)
-            buf = oiio.ImageBuf(spec)
-            buf.set_pixels(oiio.ROI(0, config.width, 0, config.height, 0, 1, 0, 3), img_array)
-            buf.write(frame_path)
-
-            frame_paths.append(frame_path)
+        # 帧 idx 呈现长画布上 [idx * config.height, (idx + 1) * config.height) 的窗口，帧之间相互独立
+        frame_plan = [
+            (idx * config.height, os.path.join(target_dir, f"frame_{idx:05d}.tiff"))
+            for idx in range(frame_count)
+        ]
+
+        with _reserve_sequence_workers(frame_count) as workers:
+            if workers > 1:
+                frame_paths = self._render_frames_parallel(config, total_height, frame_plan, workers)
+            else:
+                frame_paths = [
+                    frame_path for _, frame_path, _ in self._iter_frames_pipelined(config, total_height, frame_plan)
+                ]
 
         render_time = (time.time() - start_time) * 1000
         return frame_paths, render_time, total_height
 
     # ---- 核心绘制 ----
-    def _render_subtitle(self, canvas: skia.Canvas, subtitle: SubtitleItem,
-                         canvas_width: int, canvas_height: int):
+    @staticmethod
+    def _make_text_paint() -> skia.Paint:
         """
-        渲染单个字幕；逻辑与 RenderEngineSkia 保持一致，支持中英文字体分离与字距。
-        注意：保持浮点坐标精度，禁用 hinting 以避免像素对齐导致的重复帧问题。
+        创建文字画笔（抗锯齿、无 hinting、亚像素定位），每个引擎实例只创建一次，各字幕之间只替换颜色
         """
         paint = skia.Paint(
             AntiAlias=True,
@@ -615,6 +1085,22 @@ class LongScrollRenderEngineSkia:
         except (AttributeError, TypeError):
             # 如果 API 不支持，继续使用默认设置
             pass
+        return paint
+
+    def _render_subtitle(self, canvas: skia.Canvas, subtitle: SubtitleItem,
+                         canvas_width: int, canvas_height: int,
+                         layout: Optional[SubtitleLayout] = None,
+                         paint: Optional[skia.Paint] = None):
+        """
+        渲染单个字幕；逻辑与 RenderEngineSkia 保持一致，支持中英文字体分离与字距。
+        注意：保持浮点坐标精度，禁用 hinting 以避免像素对齐导致的重复帧问题。
+        """
+        # 空白字幕（间隔占位）没有可绘制的内容，直接返回，不设置画笔、不分行
+        if not subtitle.text.strip():
+            return
+
+        if paint is None:
+            paint = self._text_paint
 
         paint.setColor(skia.Color(
             subtitle.color[0],
@@ -622,76 +1108,92 @@ class LongScrollRenderEngineSkia:
             subtitle.color[2],
         ))
 
-        lines = subtitle.text.split('\n')
+        if layout is None:
+            layout = SubtitleLayout(subtitle.text.split('\n'), float(subtitle.font_size * subtitle.line_height), 0)
+        lines = layout.lines
         # 保持 y_offset 为浮点数，不要强制取整
         y_offset = float(subtitle.y)
-        line_height = float(subtitle.font_size * subtitle.line_height)
+        line_height = layout.line_advance
+
+        # 行、段循环内不变的字幕属性和方法提前绑定为局部变量，避免每段重复属性查找
+        family_en = subtitle.font_family
+        family_cn = subtitle.font_family_cn
+        font_size = subtitle.font_size
+        letter_spacing = subtitle.letter_spacing
+        x_start = float(subtitle.x)
+        get_font = self.get_font
+        glyph_run = self._glyph_run
 
         for line in lines:
             if not line.strip():
                 y_offset += line_height
                 continue
 
-            if subtitle.letter_spacing != 0:
-                x_offset = float(subtitle.x)
-                for char in line:
-                    is_cn = self.is_chinese_char(char)
-                    if is_cn and subtitle.font_family_cn:
-                        font = self.get_font(subtitle.font_family_cn, subtitle.font_size, is_chinese=True)
-                    else:
-                        font = self.get_font(subtitle.font_family, subtitle.font_size, is_chinese=False)
-
-                    # 尝试使用 TextBlob 以获得更好的亚像素支持，fallback 到 drawString
-                    try:
-                        blob = skia.TextBlob(char, font)
-                        canvas.drawTextBlob(blob, x_offset, y_offset, paint)
-                    except (AttributeError, TypeError):
-                        # 如果 TextBlob 不可用，使用 drawString
-                        canvas.drawString(char, x_offset, y_offset, font, paint)
-
-                    char_width = font.measureText(char)
-                    x_offset += char_width + subtitle.letter_spacing
+            # 整行构建一个 TextBlob（每段/每字一个定位 run），一次 drawTextBlob 绘制，不再逐段/逐字整形和绘制
+            builder = skia.TextBlobBuilder()
+            if letter_spacing != 0:
+                # 按中英文段选择字体（未设置中文字体时整行使用英文字体），每段一次取字形和字宽，
+                # 字形位置由字宽 + 字间距的前缀和得到（顺序累加，与逐字 x_offset += 宽度 + 字间距 逐位一致）
+                runs = segment_runs(line) if family_cn else ((line, False, 0),)
+                x_offset = x_start
+                for segment, is_cn, _ in runs:
+                    family = family_cn if is_cn else family_en
+                    font = get_font(family, font_size, is_chinese=is_cn)
+                    run = glyph_run(family, font_size, is_cn, segment)
+                    advances = run.widths + letter_spacing
+                    run_xpos = np.cumsum(np.concatenate(([x_offset], advances)))
+                    builder.allocRunPosH(font, run.glyphs, run_xpos[:-1].tolist(), y_offset)
+                    x_offset = float(run_xpos[-1])
             else:
-                x_offset = float(subtitle.x)
-                current_segment = ""
-                current_is_cn = None
-
-                for char in line:
-                    is_cn = self.is_chinese_char(char)
-
-                    if current_is_cn is not None and is_cn != current_is_cn:
-                        if current_segment:
-                            font = self.get_font(
-                                subtitle.font_family_cn if current_is_cn else subtitle.font_family,
-                                subtitle.font_size,
-                                is_chinese=current_is_cn,
-                            )
-                            # 尝试使用 TextBlob 以获得更好的亚像素支持
-                            try:
-                                blob = skia.TextBlob(current_segment, font)
-                                canvas.drawTextBlob(blob, x_offset, y_offset, paint)
-                            except (AttributeError, TypeError):
-                                canvas.drawString(current_segment, x_offset, y_offset, font, paint)
-                            segment_width = font.measureText(current_segment)
-                            x_offset += segment_width
-                        current_segment = ""
-
-                    current_segment += char
-                    current_is_cn = is_cn
-
-                if current_segment:
-                    font = self.get_font(
-                        subtitle.font_family_cn if current_is_cn else subtitle.font_family,
-                        subtitle.font_size,
-                        is_chinese=current_is_cn if current_is_cn is not None else False,
-                    )
-                    # 尝试使用 TextBlob 以获得更好的亚像素支持
-                    try:
-                        blob = skia.TextBlob(current_segment, font)
-                        canvas.drawTextBlob(blob, x_offset, y_offset, paint)
-                    except (AttributeError, TypeError):
-                        canvas.drawString(current_segment, x_offset, y_offset, font, paint)
+                x_offset = x_start
+                for segment, is_cn, _ in segment_runs(line):
+                    family = family_cn if is_cn else family_en
+                    font = get_font(family, font_size, is_chinese=is_cn)
+                    run = glyph_run(family, font_size, is_cn, segment)
+                    # 段内字形位置按 float32 累加，与 drawTextBlob(x, y) 平移后的结果逐位一致
+                    run_xpos = np.float32(x_offset) + run.xpos
+                    builder.allocRunPosH(font, run.glyphs, run_xpos.tolist(), y_offset)
+                    x_offset += run.advance
+
+            blob = builder.make()
+            if blob is not None:
+                canvas.drawTextBlob(blob, 0, 0, paint)
 
             # 保持浮点精度，不要取整
             y_offset += line_height
 
+
+# ---- 多进程序列帧渲染（工作进程侧） ----
+_worker_engine: Optional[LongScrollRenderEngineSkia] = None
+_worker_config: Optional[RenderConfig] = None
+_worker_total_height: int = 0
+
+
+def _init_frame_worker(
+    config_json: str,
+    total_height: int,
+    enable_baseline_snap: bool,
+    enable_hinting: bool,
+    picture_data: bytes,
+):
+    """
+    工作进程初始化：构建引擎和配置，反序列化主进程录制好的 picture 并放入本进程的 picture 缓存，
+    整个进程生命周期内复用；反序列化失败时在本进程重新录制
+    """
+    global _worker_engine, _worker_config, _worker_total_height
+    _worker_engine = LongScrollRenderEngineSkia()
+    _worker_engine.enable_baseline_snap = enable_baseline_snap
+    _worker_engine.enable_hinting = enable_hinting
+    _worker_config = RenderConfig.model_validate_json(config_json)
+    picture = skia.Picture.MakeFromData(picture_data)
+    if picture is not None:
+        _picture_cache[_worker_engine._picture_key(_worker_config, total_height)] = picture
+    _worker_engine._get_or_build_picture(_worker_config, total_height)
+    _worker_total_height = total_height
+
+
+def _render_one_frame(task: Tuple[int, str]) -> str:
+    """渲染一帧并写出 TIFF，返回帧路径"""
+    y_start, frame_path = task
+    _worker_engine._render_frame_tiff(_worker_config, _worker_total_height, y_start, frame_path)
+    return frame_path
@@ -12,97 +12,174 @@ import time
 import platform
 import tempfile
 import os
+from collections import OrderedDict
+from functools import lru_cache
 from io import BytesIO
-from typing import List, Tuple, Optional
+from typing import List, NamedTuple, Tuple, Optional
 import numpy as np
 import skia
 import OpenImageIO as oiio
 
 from app.models import SubtitleItem, RenderConfig
+from app.text_segments import SCRIPT_RUN_RE
+
+# 字形 run 缓存条目上限，超过后整体清空
+MEASURE_CACHE_SIZE = 65536
+# 字体对象缓存条目上限（按字体、字号、字体模式区分），超过后淘汰最久未用的条目，长时间运行不会无限增长
+FONT_CACHE_SIZE = int(os.getenv("FONT_CACHE_SIZE", "128"))
+# 复用的绘制表面数量（按尺寸区分，预览/成片尺寸在编辑过程中通常固定）
+SURFACE_POOL_SIZE = 4
+# OIIO 的 Python 绑定不支持写入内存（IOProxy），成片编码时的临时文件优先放在内存文件系统中，
+# 避免落盘；没有 /dev/shm 的平台使用系统默认临时目录
+OIIO_TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+# 预览图编码格式：png（默认，无损）或 jpeg（编码耗时约为 PNG 的 40%，文字边缘有轻微压缩痕迹，需显式开启）
+# Skia 的 PNG 编码忽略质量参数、无法降低 zlib 级别，要进一步缩短预览编码只能换格式
+PREVIEW_IMAGE_FORMAT = os.getenv("PREVIEW_IMAGE_FORMAT", "png").lower()
+PREVIEW_JPEG_QUALITY = int(os.getenv("PREVIEW_JPEG_QUALITY", "85"))
+PREVIEW_MIME_TYPE = "image/jpeg" if PREVIEW_IMAGE_FORMAT == "jpeg" else "image/png"
+# 成片 TIFF 压缩方式（zip / lzw / none），默认 zip 与 OIIO 默认一致；lzw 写入更快，none 最快但体积最大
+# 整帧一次 write_image 交给 OIIO，由其按条带并行压缩（tiff:multithread），无需改为分块（tile）TIFF
+FINAL_TIFF_COMPRESSION = os.getenv("FINAL_TIFF_COMPRESSION", "zip")
+
+# 默认字体候选路径（按平台，依次取第一个存在的文件）
+DEFAULT_FONT_CANDIDATES = {
+    "Darwin": (
+        # 中文：PingFang，找不到时使用黑体
+        [
+            "/System/Library/Fonts/PingFang.ttc",
+            "/System/Library/Fonts/Supplemental/PingFang.ttc",
+            "/Library/Fonts/PingFang.ttc",
+            "/System/Library/Fonts/STHeiti Light.ttc",
+        ],
+        # 英文：Helvetica
+        [
+            "/System/Library/Fonts/Helvetica.ttc",
+            "/System/Library/Fonts/HelveticaNeue.ttc",
+        ],
+    ),
+    "Windows": (
+        ["C:/Windows/Fonts/msyh.ttc"],  # 微软雅黑
+        ["C:/Windows/Fonts/arial.ttf"],
+    ),
+    "Linux": (
+        ["/usr/share/fonts/truetype/wqy/wqy-microhei.ttc"],
+        ["/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"],
+    ),
+}
+
+
+@lru_cache(maxsize=1)
+def resolve_default_fonts() -> Tuple[Optional[str], Optional[str]]:
+    """
+    解析默认的 (中文字体, 英文字体) 路径，找不到时为 None（get_font 会回退到 Skia 默认字体）
+    只检查文件是否存在，不解析字体文件；结果在进程内缓存，多个引擎实例/工作进程共用
+    """
+    cn_paths, en_paths = DEFAULT_FONT_CANDIDATES.get(platform.system(), DEFAULT_FONT_CANDIDATES["Linux"])
+    cn_font = next((path for path in cn_paths if os.path.isfile(path)), None)
+    en_font = next((path for path in en_paths if os.path.isfile(path)), None)
+    return cn_font, en_font
+
+
+@lru_cache(maxsize=64)
+def load_typeface(font_family: str, is_chinese: bool) -> Optional[skia.Typeface]:
+    """
+    加载字体文件（进程内缓存，各引擎实例/线程共用）
+    Typeface 与字号、hinting 等字体模式无关且不可变，只需解析一次；
+    引擎的 font_cache 按字号和字体模式区分条目，同一字体文件的各条目共用这里的 Typeface，只需读取、解析一次
+    加载失败时回退到默认中文/英文字体
+    """
+    try:
+        # 尝试加载指定字体
+        return skia.Typeface.MakeFromFile(font_family)
+    except:
+        # 如果失败，使用默认字体
+        default_cn_font, default_en_font = resolve_default_fonts()
+        default_font = default_cn_font if is_chinese else default_en_font
+        if default_font:
+            try:
+                return skia.Typeface.MakeFromFile(default_font)
+            except:
+                pass
+        return skia.Typeface.MakeDefault()
+
+
+@lru_cache(maxsize=4096)
+def segment_runs(line: str) -> Tuple[Tuple[str, bool, int], ...]:
+    """
+    将一行文本切分为中/英文连续段，返回 ((段落, 是否中文, 起始字符下标), ...)
+    按 CJK_RANGES 区间判断中文（与 Pillow 引擎一致），正则一次扫描得到各段，不再逐字判断、拼接；
+    同一行在各区段/各帧中反复出现，结果按行缓存
+    纯 ASCII 行（英文演职员表的大多数行）不可能含中文，直接整行作为一段
+    """
+    if line.isascii():
+        return ((line, False, 0),)
+    return tuple((m.group(), m.lastgroup == "cn", m.start()) for m in SCRIPT_RUN_RE.finditer(line))
+
+
+def write_oiio_image(path: str, spec, pixels: np.ndarray):
+    """
+    用 OIIO ImageOutput 直接从像素数组写出图像文件（格式由扩展名决定），失败时抛出 RuntimeError
+    不再先 set_pixels 复制进 ImageBuf 再写出；OIIO 按数组步长读取，RGBA 缓冲的 RGB 视图也无需先拷贝成连续数组
+    """
+    out = oiio.ImageOutput.create(path)
+    if out is None:
+        raise RuntimeError(f"无法创建图像输出 {path}: {oiio.geterror()}")
+    try:
+        if not out.open(path, spec) or not out.write_image(pixels):
+            raise RuntimeError(f"写入图像失败 {path}: {out.geterror()}")
+    finally:
+        out.close()
+
+
+class GlyphRun(NamedTuple):
+    """文本段的整形结果（同一字体、同一字体模式下与绘制位置无关，可跨行/跨请求复用）"""
+    glyphs: List[int]
+    widths: np.ndarray  # 每个字形的字宽（float64）
+    xpos: np.ndarray  # 段内每个字形相对段起点的 x 位置（float32）
+    advance: float  # 整段的水平宽度（measureText，无字间距时用于推进下一段的起点）
+
+
+def shape_run(font: skia.Font, text: str) -> GlyphRun:
+    """
+    用指定字体整形文本段，得到字形、字宽、段内字形位置和整段宽度
+    返回的数组设为只读，结果可放入各引擎的 run 缓存中共享
+    """
+    glyphs = font.textToGlyphs(text)
+    widths = np.asarray(font.getWidths(glyphs), dtype=np.float64)
+    xpos = np.asarray(font.getXPos(glyphs), dtype=np.float32)
+    widths.flags.writeable = False
+    xpos.flags.writeable = False
+    return GlyphRun(glyphs, widths, xpos, font.measureText(text))
 
 
 class RenderEngineSkia:
     """使用 Skia 的统一渲染引擎"""
     
     def __init__(self):
-        self.font_cache = {}
+        self.font_cache: "OrderedDict[Tuple[str, int, bool, bool, bool], skia.Font]" = OrderedDict()
         self._init_default_fonts()
         # 字体渲染配置（用于"确保没有滚动"模式）
         self.enable_baseline_snap = False
         self.enable_hinting = False
+        # 字形 run 缓存：(字体参数, 字体模式, 文本段) -> GlyphRun（字形、字宽、段内位置、整段宽度）
+        self._run_cache = {}
+        # 可复用的绘制表面：(宽, 高) -> Surface，避免每次预览/成片都重新分配像素内存
+        self._surface_pool: "OrderedDict[Tuple[int, int], skia.Surface]" = OrderedDict()
+        # 文字画笔：引擎实例内共用一个，各字幕绘制前只替换颜色（引擎按线程隔离，无需加锁）
+        self._text_paint = self._make_text_paint()
+        # 成片像素回读缓冲：(width, height) -> (height, width, 4) uint8，各次成片输出之间复用
+        self._frame_buffers = {}
     
     def _init_default_fonts(self):
-        """初始化默认字体路径"""
-        system = platform.system()
-        if system == "Darwin":  # macOS
-            # 尝试多个可能的 PingFang 字体路径
-            pingfang_paths = [
-                "/System/Library/Fonts/PingFang.ttc",
-                "/System/Library/Fonts/Supplemental/PingFang.ttc",
-                "/Library/Fonts/PingFang.ttc",
-            ]
-            self.default_cn_font = None
-            for path in pingfang_paths:
-                try:
-                    skia.Typeface.MakeFromFile(path)
-                    self.default_cn_font = path
-                    break
-                except:
-                    continue
-            # 如果找不到 PingFang，尝试其他中文字体
-            if not self.default_cn_font:
-                try:
-                    self.default_cn_font = "/System/Library/Fonts/STHeiti Light.ttc"
-                    skia.Typeface.MakeFromFile(self.default_cn_font)
-                except:
-                    self.default_cn_font = None
-            
-            # 英文字体
-            helvetica_paths = [
-                "/System/Library/Fonts/Helvetica.ttc",
-                "/System/Library/Fonts/HelveticaNeue.ttc",
-            ]
-            self.default_en_font = None
-            for path in helvetica_paths:
-                try:
-                    skia.Typeface.MakeFromFile(path)
-                    self.default_en_font = path
-                    break
-                except:
-                    continue
-        elif system == "Windows":
-            self.default_cn_font = "C:/Windows/Fonts/msyh.ttc"  # 微软雅黑
-            self.default_en_font = "C:/Windows/Fonts/arial.ttf"
-        else:  # Linux
-            self.default_cn_font = "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc"
-            self.default_en_font = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+        """初始化默认字体路径（每个进程只解析一次）"""
+        self.default_cn_font, self.default_en_font = resolve_default_fonts()
     
     def get_font(self, font_family: str, font_size: int, is_chinese: bool = False) -> skia.Font:
         """获取 Skia 字体（带缓存），根据配置启用/禁用 Baseline Snapping 和 Hinting"""
         # 将字体配置也加入缓存键，因为不同配置需要不同的字体对象
-        cache_key = f"{font_family}_{font_size}_{is_chinese}_{self.enable_baseline_snap}_{self.enable_hinting}"
+        cache_key = (font_family, font_size, is_chinese, self.enable_baseline_snap, self.enable_hinting)
         if cache_key not in self.font_cache:
-            try:
-                # 尝试加载指定字体
-                typeface = skia.Typeface.MakeFromFile(font_family)
-            except:
-                # 如果失败，使用默认字体
-                if is_chinese:
-                    if self.default_cn_font:
-                        try:
-                            typeface = skia.Typeface.MakeFromFile(self.default_cn_font)
-                        except:
-                            typeface = skia.Typeface.MakeDefault()
-                    else:
-                        typeface = skia.Typeface.MakeDefault()
-                else:
-                    if self.default_en_font:
-                        try:
-                            typeface = skia.Typeface.MakeFromFile(self.default_en_font)
-                        except:
-                            typeface = skia.Typeface.MakeDefault()
-                    else:
-                        typeface = skia.Typeface.MakeDefault()
+            typeface = load_typeface(font_family, is_chinese)
             
             # 创建 Skia Font 对象
             font = skia.Font(typeface, font_size)
@@ -144,15 +221,47 @@ class RenderEngineSkia:
                 pass
 
             self.font_cache[cache_key] = font
+            while len(self.font_cache) > FONT_CACHE_SIZE:
+                self.font_cache.popitem(last=False)
+            return font
+        self.font_cache.move_to_end(cache_key)
         return self.font_cache[cache_key]
     
-    def is_chinese_char(self, char: str) -> bool:
-        """判断字符是否为中文"""
-        return '\u4e00' <= char <= '\u9fff'
+    def _glyph_run(self, font_family: str, font_size: int, is_chinese: bool, text: str) -> GlyphRun:
+        """
+        取文本段的字形、字宽、段内字形位置和整段宽度（带缓存），一次查找得到绘制和推进 x 所需的全部度量
+        缓存键使用字体参数和当前字体模式而不是字体对象（id 可能在字体对象回收后被复用）
+        演职员表中重复的职务、词语只需整形一次；返回的数组只读，调用方不得原地修改
+        """
+        key = (font_family, font_size, is_chinese, self.enable_baseline_snap, self.enable_hinting, text)
+        run = self._run_cache.get(key)
+        if run is None:
+            if len(self._run_cache) >= MEASURE_CACHE_SIZE:
+                self._run_cache.clear()
+            run = self._run_cache[key] = shape_run(self.get_font(font_family, font_size, is_chinese=is_chinese), text)
+        return run
+    
+    def _acquire_surface(self, width: int, height: int) -> skia.Surface:
+        """
+        获取指定尺寸的可复用表面（不清空内容，由调用方 clear），并重置画布的变换/裁剪状态
+        快照与表面共享像素时，再次绘制会由 Skia 写时复制，已取出的快照不受影响
+        """
+        key = (width, height)
+        surface = self._surface_pool.get(key)
+        if surface is None:
+            surface = self._surface_pool[key] = skia.Surface(width, height)
+            while len(self._surface_pool) > SURFACE_POOL_SIZE:
+                self._surface_pool.popitem(last=False)
+        else:
+            self._surface_pool.move_to_end(key)
+            canvas = surface.getCanvas()
+            canvas.restoreToCount(1)
+            canvas.resetMatrix()
+        return surface
     
     def render_preview(self, config: RenderConfig) -> Tuple[bytes, float]:
         """
-        渲染预览帧（PNG格式，用于前端显示）
+        渲染预览帧（默认 PNG 格式，格式见 PREVIEW_MIME_TYPE，用于前端显示）
         使用与最终渲染相同的逻辑，只是输出格式不同
         预览模式下使用 1/4 分辨率以提升实时性
         """
@@ -166,8 +275,6 @@ class RenderEngineSkia:
         if config.ensure_no_scroll:
             self.enable_baseline_snap = True
             self.enable_hinting = True
-            # 清空字体缓存，因为配置改变了
-            self.font_cache.clear()
         else:
             self.enable_baseline_snap = False
             self.enable_hinting = False
@@ -180,7 +287,7 @@ class RenderEngineSkia:
             surface_height = max(1, int(config.height * preview_scale))
             
             # 使用 Skia 渲染
-            surface = skia.Surface(surface_width, surface_height)
+            surface = self._acquire_surface(surface_width, surface_height)
             canvas = surface.getCanvas()
             
             # 缩放画布，保持逻辑坐标仍为原始分辨率
@@ -198,29 +305,28 @@ class RenderEngineSkia:
             for subtitle in config.subtitles:
                 self._render_subtitle(canvas, subtitle, config.width, config.height)
             
-            # 转换为 PNG
+            # 编码为 PNG（或 PREVIEW_IMAGE_FORMAT=jpeg 时编码为 JPEG，背景不透明，无需 alpha）
             image = surface.makeImageSnapshot()
-            # encodeToData 需要格式和质量参数，或者无参数（自动检测）
-            png_data = image.encodeToData(skia.EncodedImageFormat.kPNG, 100)
+            if PREVIEW_MIME_TYPE == "image/jpeg":
+                preview_data = image.encodeToData(skia.EncodedImageFormat.kJPEG, PREVIEW_JPEG_QUALITY)
+            else:
+                # encodeToData 需要格式和质量参数，或者无参数（自动检测）
+                preview_data = image.encodeToData(skia.EncodedImageFormat.kPNG, 100)
             
             render_time = (time.time() - start_time) * 1000  # 转换为毫秒
             
-            return bytes(png_data), render_time
+            return bytes(preview_data), render_time
         finally:
             # 恢复原始字体配置
             self.enable_baseline_snap = original_baseline_snap
             self.enable_hinting = original_hinting
-            self.font_cache.clear()
     
-    def render_final_dpx(self, config: RenderConfig) -> Tuple[bytes, float]:
+    def render_final_rgb(self, config: RenderConfig) -> np.ndarray:
         """
-        渲染最终输出（DPX格式）
-        使用与预览完全相同的文本渲染逻辑，然后通过 OIIO 输出为 DPX
+        以全分辨率渲染成片，返回 (height, width, 3) 连续 RGB 像素（只读）
+        成片输出沿用引擎当前的 baseline snap / hinting 设置；跨请求的像素缓存由调用方（main.py）负责
         """
-        start_time = time.time()
-        
-        # 使用 Skia 渲染（与预览相同的逻辑）
-        surface = skia.Surface(config.width, config.height)
+        surface = self._acquire_surface(config.width, config.height)
         canvas = surface.getCanvas()
         
         # 设置背景色
@@ -234,17 +340,25 @@ class RenderEngineSkia:
         for subtitle in config.subtitles:
             self._render_subtitle(canvas, subtitle, config.width, config.height)
         
-        # 获取像素数据
-        image = surface.makeImageSnapshot()
-        pixels = image.tobytes()
+        # 回读缓冲会被下一次成片输出覆盖，返回紧凑的 RGB 拷贝（调用方可缓存，OIIO 写出时也无需按步长跳读）
+        img_array = np.ascontiguousarray(self._read_surface_rgb(surface, config.width, config.height))
+        img_array.flags.writeable = False
+        return img_array
+    
+    def render_final_dpx(self, config: RenderConfig,
+                          img_array: Optional[np.ndarray] = None) -> Tuple[bytes, float]:
+        """
+        渲染最终输出（DPX格式）
+        使用与预览完全相同的文本渲染逻辑，然后通过 OIIO 输出为 DPX
+        """
+        start_time = time.time()
         
-        # 转换为 numpy 数组
-        img_array = np.frombuffer(pixels, dtype=np.uint8)
-        img_array = img_array.reshape((config.height, config.width, 4))  # RGBA
-        img_array = img_array[:, :, :3]  # 转换为 RGB
+        # 使用 Skia 渲染（与预览相同的逻辑）；调用方已有该配置的成片像素（render_final_rgb 的结果）时直接写出
+        if img_array is None:
+            img_array = self.render_final_rgb(config)
         
         # 使用 OIIO 保存为 DPX 格式
-        with tempfile.NamedTemporaryFile(suffix='.dpx', delete=False) as tmp_file:
+        with tempfile.NamedTemporaryFile(suffix='.dpx', dir=OIIO_TEMP_DIR, delete=False) as tmp_file:
             tmp_path = tmp_file.name
         
         try:
@@ -252,14 +366,8 @@ class RenderEngineSkia:
             spec = oiio.ImageSpec(config.width, config.height, 3, oiio.UINT8)
             spec.attribute("oiio:BitsPerSample", 8)
             
-            # 创建 ImageBuf
-            buf = oiio.ImageBuf(spec)
-            
-            # 设置像素数据
-            buf.set_pixels(oiio.ROI(0, config.width, 0, config.height, 0, 1, 0, 3), img_array)
-            
-            # 写入 DPX 文件
-            buf.write(tmp_path)
+            # 写入 DPX 文件（ImageOutput 直接从像素数组写出）
+            write_oiio_image(tmp_path, spec, img_array)
             
             # 读取文件内容
             with open(tmp_path, 'rb') as f:
@@ -273,53 +381,29 @@ class RenderEngineSkia:
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
     
-    def render_final_tiff(self, config: RenderConfig) -> Tuple[bytes, float]:
+    def render_final_tiff(self, config: RenderConfig,
+                          img_array: Optional[np.ndarray] = None) -> Tuple[bytes, float]:
         """
         渲染最终输出（TIFF格式）
         使用与预览完全相同的文本渲染逻辑，然后通过 OIIO 输出为 TIFF
         """
         start_time = time.time()
         
-        # 使用 Skia 渲染（与预览相同的逻辑）
-        surface = skia.Surface(config.width, config.height)
-        canvas = surface.getCanvas()
-        
-        # 设置背景色
-        canvas.clear(skia.Color(
-            config.background_color[0],
-            config.background_color[1],
-            config.background_color[2]
-        ))
-        
-        # 渲染每个字幕（使用相同的函数，确保一致性）
-        for subtitle in config.subtitles:
-            self._render_subtitle(canvas, subtitle, config.width, config.height)
-        
-        # 获取像素数据
-        image = surface.makeImageSnapshot()
-        pixels = image.tobytes()
-        
-        # 转换为 numpy 数组
-        img_array = np.frombuffer(pixels, dtype=np.uint8)
-        img_array = img_array.reshape((config.height, config.width, 4))  # RGBA
-        img_array = img_array[:, :, :3]  # 转换为 RGB
+        # 使用 Skia 渲染（与预览相同的逻辑）；调用方已有该配置的成片像素（render_final_rgb 的结果）时直接写出
+        if img_array is None:
+            img_array = self.render_final_rgb(config)
         
         # 使用 OIIO 保存为 TIFF 格式
-        with tempfile.NamedTemporaryFile(suffix='.tiff', delete=False) as tmp_file:
+        with tempfile.NamedTemporaryFile(suffix='.tiff', dir=OIIO_TEMP_DIR, delete=False) as tmp_file:
             tmp_path = tmp_file.name
         
         try:
             # 创建 OIIO ImageSpec
             spec = oiio.ImageSpec(config.width, config.height, 3, oiio.UINT8)
+            spec.attribute("compression", FINAL_TIFF_COMPRESSION)
             
-            # 创建 ImageBuf
-            buf = oiio.ImageBuf(spec)
-            
-            # 设置像素数据
-            buf.set_pixels(oiio.ROI(0, config.width, 0, config.height, 0, 1, 0, 3), img_array)
-            
-            # 写入 TIFF 文件
-            buf.write(tmp_path)
+            # 写入 TIFF 文件（ImageOutput 直接从像素数组写出）
+            write_oiio_image(tmp_path, spec, img_array)
             
             # 读取文件内容
             with open(tmp_path, 'rb') as f:
@@ -333,15 +417,24 @@ class RenderEngineSkia:
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
     
-    def _render_subtitle(self, canvas: skia.Canvas, subtitle: SubtitleItem, 
-                        canvas_width: int, canvas_height: int):
+    def _read_surface_rgb(self, surface: skia.Surface, width: int, height: int) -> np.ndarray:
         """
-        渲染单个字幕
-        这是核心渲染逻辑，预览和最终渲染都使用这个方法
-        支持中英文字体分离
-        注意：保持浮点坐标精度，禁用 hinting 以避免像素对齐
+        将表面像素按 RGBA 顺序读入复用的缓冲，返回其 RGB 视图（下一次成片输出会覆盖）
+        显式指定 kRGBA_8888：Skia 默认是平台相关的 N32（小端机器上为 BGRA），直接 tobytes 会交换 R/B
+        """
+        rgba = self._frame_buffers.get((width, height))
+        if rgba is None:
+            rgba = self._frame_buffers[(width, height)] = np.empty((height, width, 4), dtype=np.uint8)
+        info = skia.ImageInfo.Make(width, height, skia.kRGBA_8888_ColorType, skia.kPremul_AlphaType)
+        if not surface.readPixels(info, rgba, width * 4, 0, 0):
+            raise RuntimeError("回读像素失败")
+        return rgba[:, :, :3]
+    
+    @staticmethod
+    def _make_text_paint() -> skia.Paint:
+        """
+        创建文字画笔（抗锯齿、无 hinting、亚像素定位），每个引擎实例只创建一次，各字幕之间只替换颜色
         """
-        # 创建 Skia Paint 对象
         paint = skia.Paint(
             AntiAlias=True,  # 启用抗锯齿
             Style=skia.Paint.kFill_Style,
@@ -364,6 +457,23 @@ class RenderEngineSkia:
         except (AttributeError, TypeError):
             # 如果 API 不支持，继续使用默认设置
             pass
+        return paint
+    
+    def _render_subtitle(self, canvas: skia.Canvas, subtitle: SubtitleItem, 
+                        canvas_width: int, canvas_height: int,
+                        paint: Optional[skia.Paint] = None):
+        """
+        渲染单个字幕
+        这是核心渲染逻辑，预览和最终渲染都使用这个方法
+        支持中英文字体分离
+        注意：保持浮点坐标精度，禁用 hinting 以避免像素对齐
+        """
+        # 空白字幕（间隔占位）没有可绘制的内容，直接返回，不设置画笔、不分行
+        if not subtitle.text.strip():
+            return
+        
+        if paint is None:
+            paint = self._text_paint
         
         # 设置颜色
         paint.setColor(skia.Color(
@@ -378,80 +488,52 @@ class RenderEngineSkia:
         y_offset = float(subtitle.y)
         line_height = float(subtitle.font_size * subtitle.line_height)
         
+        # 行、段循环内不变的字幕属性和方法提前绑定为局部变量，避免每段重复属性查找
+        family_en = subtitle.font_family
+        family_cn = subtitle.font_family_cn
+        font_size = subtitle.font_size
+        letter_spacing = subtitle.letter_spacing
+        x_start = float(subtitle.x)
+        get_font = self.get_font
+        glyph_run = self._glyph_run
+
         for line in lines:
             if not line.strip():
                 y_offset += line_height
                 continue
             
+            # 整行构建一个 TextBlob（每段/每字一个定位 run），一次 drawTextBlob 绘制，不再逐段/逐字整形和绘制
+            builder = skia.TextBlobBuilder()
             # 处理字间距
-            if subtitle.letter_spacing != 0:
-                # 逐字符渲染以实现字间距和中英文字体分离
-                x_offset = float(subtitle.x)
-                for char in line:
-                    # 根据字符类型选择字体
-                    is_cn = self.is_chinese_char(char)
-                    if is_cn and subtitle.font_family_cn:
-                        font = self.get_font(subtitle.font_family_cn, subtitle.font_size, is_chinese=True)
-                    else:
-                        font = self.get_font(subtitle.font_family, subtitle.font_size, is_chinese=False)
-                    
-                    # 尝试使用 TextBlob 以获得更好的亚像素支持，fallback 到 drawString
-                    try:
-                        blob = skia.TextBlob(char, font)
-                        canvas.drawTextBlob(blob, x_offset, y_offset, paint)
-                    except (AttributeError, TypeError):
-                        # 如果 TextBlob 不可用，使用 drawString
-                        canvas.drawString(char, x_offset, y_offset, font, paint)
-                    
-                    # 获取字符宽度并添加字间距
-                    char_width = font.measureText(char)  # 返回 float
-                    x_offset += char_width + subtitle.letter_spacing
+            if letter_spacing != 0:
+                # 按中英文段选择字体（未设置中文字体时整行使用英文字体），每段一次取字形和字宽，
+                # 字形位置由字宽 + 字间距的前缀和得到（顺序累加，与逐字 x_offset += 宽度 + 字间距 逐位一致）
+                runs = segment_runs(line) if family_cn else ((line, False, 0),)
+                x_offset = x_start
+                for segment, is_cn, _ in runs:
+                    family = family_cn if is_cn else family_en
+                    font = get_font(family, font_size, is_chinese=is_cn)
+                    run = glyph_run(family, font_size, is_cn, segment)
+                    advances = run.widths + letter_spacing
+                    run_xpos = np.cumsum(np.concatenate(([x_offset], advances)))
+                    builder.allocRunPosH(font, run.glyphs, run_xpos[:-1].tolist(), y_offset)
+                    x_offset = float(run_xpos[-1])
             else:
                 # 正常渲染（无字间距，但需要处理中英文字体分离）
-                # 将文本按中英文分组
-                x_offset = float(subtitle.x)
-                current_segment = ""
-                current_is_cn = None
-                
-                for char in line:
-                    is_cn = self.is_chinese_char(char)
-                    
-                    # 如果字符类型改变，先渲染之前的段落
-                    if current_is_cn is not None and is_cn != current_is_cn:
-                        if current_segment:
-                            font = self.get_font(
-                                subtitle.font_family_cn if current_is_cn else subtitle.font_family,
-                                subtitle.font_size,
-                                is_chinese=current_is_cn
-                            )
-                            # 尝试使用 TextBlob 以获得更好的亚像素支持
-                            try:
-                                blob = skia.TextBlob(current_segment, font)
-                                canvas.drawTextBlob(blob, x_offset, y_offset, paint)
-                            except (AttributeError, TypeError):
-                                canvas.drawString(current_segment, x_offset, y_offset, font, paint)
-                            
-                            # 计算已渲染文本的宽度
-                            segment_width = font.measureText(current_segment)  # 返回 float
-                            x_offset += segment_width
-                        current_segment = ""
-                    
-                    current_segment += char
-                    current_is_cn = is_cn
-                
-                # 渲染最后一段
-                if current_segment:
-                    font = self.get_font(
-                        subtitle.font_family_cn if current_is_cn else subtitle.font_family,
-                        subtitle.font_size,
-                        is_chinese=current_is_cn if current_is_cn is not None else False
-                    )
-                    # 尝试使用 TextBlob 以获得更好的亚像素支持
-                    try:
-                        blob = skia.TextBlob(current_segment, font)
-                        canvas.drawTextBlob(blob, x_offset, y_offset, paint)
-                    except (AttributeError, TypeError):
-                        canvas.drawString(current_segment, x_offset, y_offset, font, paint)
+                # 将文本按中英文分组，每段一个 run、只测量一次
+                x_offset = x_start
+                for segment, is_cn, _ in segment_runs(line):
+                    family = family_cn if is_cn else family_en
+                    font = get_font(family, font_size, is_chinese=is_cn)
+                    run = glyph_run(family, font_size, is_cn, segment)
+                    # 段内字形位置按 float32 累加，与 drawTextBlob(x, y) 平移后的结果逐位一致
+                    run_xpos = np.float32(x_offset) + run.xpos
+                    builder.allocRunPosH(font, run.glyphs, run_xpos.tolist(), y_offset)
+                    x_offset += run.advance
+            
+            blob = builder.make()
+            if blob is not None:
+                canvas.drawTextBlob(blob, 0, 0, paint)
             
             # 移动到下一行（保持浮点精度）
             y_offset += line_height
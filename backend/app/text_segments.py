@@ -0,0 +1,11 @@
+"""
+中/英文分段 - Pillow 与 Skia 渲染引擎共用的中文码位区间和分段正则
+不依赖 skia，未安装 skia-python 时 Pillow 引擎同样可以导入
+"""
+import re
+
+# 中文字符码位区间：CJK 统一表意文字、扩展 A、兼容表意文字
+CJK_RANGES = ((0x4E00, 0x9FFF), (0x3400, 0x4DBF), (0xF900, 0xFAFF))
+_CJK_CLASS = "".join(f"\\u{lo:04x}-\\u{hi:04x}" for lo, hi in CJK_RANGES)
+# 中/英文连续段：一次正则扫描（C 实现）切分整行，命名分组 cn 匹配中文段
+SCRIPT_RUN_RE = re.compile(f"(?P<cn>[{_CJK_CLASS}]+)|[^{_CJK_CLASS}]+")
@@ -25,6 +25,28 @@ export async function getPreview(config: RenderConfig): Promise<PreviewResponse>
   return response.json();
 }
 
+// 获取原始 PNG 预览（不经过 base64/JSON），preview_url 为 Object URL，调用方负责 revokeObjectURL
+// 编辑器是可信客户端，走跳过服务端 Pydantic 校验的快速路径
+export async function getPreviewRaw(config: RenderConfig): Promise<PreviewResponse> {
+  const response = await fetch(`${API_BASE}/preview/fast`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify(config),
+  });
+
+  if (!response.ok) {
+    throw new Error(`Preview request failed: ${response.statusText}`);
+  }
+
+  const blob = await response.blob();
+  return {
+    preview_url: URL.createObjectURL(blob),
+    render_time_ms: Number(response.headers.get('X-Render-Time-Ms') ?? 0),
+  };
+}
+
 export async function renderDPX(config: RenderConfig): Promise<Blob> {
   const response = await fetch(`${API_BASE}/render/dpx`, {
     method: 'POST',
@@ -93,6 +115,30 @@ export async function getScrollFull(
   return response.json();
 }
 
+// 获取原始 PNG 长图，总高度通过 X-Total-Height 响应头返回；preview_url 为 Object URL
+export async function getScrollFullRaw(
+  config: RenderConfig,
+): Promise<ScrollFullPreviewResponse> {
+  const response = await fetch(`${API_BASE}/preview/scroll-full/raw`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify(config),
+  });
+
+  if (!response.ok) {
+    throw new Error(`Scroll full request failed: ${response.statusText}`);
+  }
+
+  const blob = await response.blob();
+  return {
+    preview_url: URL.createObjectURL(blob),
+    render_time_ms: Number(response.headers.get('X-Render-Time-Ms') ?? 0),
+    total_height: Number(response.headers.get('X-Total-Height') ?? config.height),
+  };
+}
+
 // 按 FPS/时长/速度 逐帧渲染 TIFF 序列（ZIP）
 export async function renderTiffSequenceFps(req: RenderSequenceRequest): Promise<Blob> {
   const response = await fetch(`${API_BASE}/render/tiff-seq-fps`, {
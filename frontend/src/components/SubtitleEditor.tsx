@@ -7,7 +7,7 @@ import {
   FrameRate,
   FRAME_RATES,
 } from '../types';
-import { getPreview, getScrollChunk, getScrollFull } from '../api';
+import { getPreviewRaw, getScrollChunk, getScrollFullRaw } from '../api';
 import { useDebounce } from '../hooks/useDebounce';
 import './SubtitleEditor.css';
 
@@ -78,14 +78,18 @@ export default function SubtitleEditor({ config, onConfigChange, onRenderParamsC
     const requestPreview = async () => {
       setIsRendering(true);
       try {
-        const response = await getPreview({
+        const response = await getPreviewRaw({
           ...debouncedConfig,
           preview: true,
           preview_scale: previewScale,
           ensure_no_scroll: ensureNoScroll || undefined,
           optimization_mode: optimizationMode || undefined,
         });
-        setPreviewUrl(response.preview_url);
+        // 释放上一张预览图的 Object URL
+        setPreviewUrl(prev => {
+          if (prev) URL.revokeObjectURL(prev);
+          return response.preview_url;
+        });
         setRenderTime(response.render_time_ms);
       } catch (error) {
         console.error('Preview request failed:', error);
@@ -102,14 +106,17 @@ export default function SubtitleEditor({ config, onConfigChange, onRenderParamsC
     const requestFull = async () => {
       setIsLoadingFull(true);
       try {
-        const response = await getScrollFull({
+        const response = await getScrollFullRaw({
           ...debouncedConfigForFull,
           preview: false,
           preview_scale: 1,
           ensure_no_scroll: ensureNoScroll || undefined,
           optimization_mode: optimizationMode || undefined,
         });
-        setFullScroll(response);
+        setFullScroll(prev => {
+          if (prev) URL.revokeObjectURL(prev.preview_url);
+          return response;
+        });
         // 重置滚动位置
         setScrollY(0);
       } catch (error) {